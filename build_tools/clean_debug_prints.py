@@ -7,6 +7,38 @@
 import os
 import re
 
+# 要清理的print语句模式
+PATTERNS_TO_CLEAN = [
+    r'print\(f?"模板已应用.*?\)\n',
+    r'print\("图层状态已变化"\)\n',
+    r'print\(f?"没有激活的案例.*?\)\n',
+    r'print\(f?"案例对象为空.*?\)\n',
+    r'print\(f?"模板文件不存在.*?\)\n',
+    r'print\(f?"模板.*?不存在"\)\n',
+    r'print\("没有激活的图层"\)\n',
+    r'print\(f?"成功应用模板.*?\)\n',
+    r'print\(f?"模板.*?没有找到匹配的参数"\)\n',
+    r'print\(f?"查找特殊参数.*?\)\n',
+    r'print\(f?"  找到位置.*?\)\n',
+    r'print\(f?"首选项设置已.*?\)\n',
+    r'print\(f?"所有配置已应用"\)\n',
+    # 工作区管理器测试相关
+    r'print\("=== 工作区管理器测试 ==="\)\n',
+    r'print\(f?"测试目录:.*?\)\n',
+    r'print\(f?"设置工作区:.*?\)\n',
+    r'print\(f?"扫描到的.qmw文件:.*?\)\n',
+    r'print\(f?"  .*?\)\n',
+    r'print\(f?"工作区验证:.*?\)\n',
+    r'print\("工作区管理器测试完成 ✓"\)\n',
+]
+
+# 所有模式合并为一个正则，只需扫描一遍文件内容
+_COMBINED_PATTERN = re.compile("|".join(f"(?:{p})" for p in PATTERNS_TO_CLEAN), re.MULTILINE)
+
+# 连续多个空行
+_BLANK_LINES_PATTERN = re.compile(r'\n\s*\n\s*\n')
+
+
 def clean_debug_prints(file_path):
     """清理文件中的调试print语句"""
     with open(file_path, 'r', encoding='utf-8') as f:
@@ -14,37 +46,11 @@ def clean_debug_prints(file_path):
     
     original_content = content
     
-    # 要清理的print语句模式
-    patterns_to_clean = [
-        r'print\(f?"模板已应用.*?\)\n',
-        r'print\("图层状态已变化"\)\n',
-        r'print\(f?"没有激活的案例.*?\)\n',
-        r'print\(f?"案例对象为空.*?\)\n',
-        r'print\(f?"模板文件不存在.*?\)\n',
-        r'print\(f?"模板.*?不存在"\)\n',
-        r'print\("没有激活的图层"\)\n',
-        r'print\(f?"成功应用模板.*?\)\n',
-        r'print\(f?"模板.*?没有找到匹配的参数"\)\n',
-        r'print\(f?"查找特殊参数.*?\)\n',
-        r'print\(f?"  找到位置.*?\)\n',
-        r'print\(f?"首选项设置已.*?\)\n',
-        r'print\(f?"所有配置已应用"\)\n',
-        # 工作区管理器测试相关
-        r'print\("=== 工作区管理器测试 ==="\)\n',
-        r'print\(f?"测试目录:.*?\)\n',
-        r'print\(f?"设置工作区:.*?\)\n',
-        r'print\(f?"扫描到的.qmw文件:.*?\)\n',
-        r'print\(f?"  .*?\)\n',
-        r'print\(f?"工作区验证:.*?\)\n',
-        r'print\("工作区管理器测试完成 ✓"\)\n',
-    ]
-    
-    # 应用所有模式清理
-    for pattern in patterns_to_clean:
-        content = re.sub(pattern, '', content, flags=re.MULTILINE)
+    # 一次性应用所有模式清理
+    content = _COMBINED_PATTERN.sub('', content)
     
     # 清理空行
-    content = re.sub(r'\n\s*\n\s*\n', '\n\n', content)
+    content = _BLANK_LINES_PATTERN.sub('\n\n', content)
     
     if content != original_content:
         with open(file_path, 'w', encoding='utf-8') as f:
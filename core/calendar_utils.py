@@ -2,7 +2,8 @@ import datetime
 import pyplanets
 import ichingpy
 import math  # 导入math库用于弧度到度数的转换
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
 
 from pyplanets.core.epoch import Epoch
 from pyplanets.planets.earth import Earth
@@ -19,6 +20,15 @@ SOLAR_TERMS = [
     (315, "立春"), (330, "雨水"), (345, "惊蛰")
 ]
 
+# 节气名称表：节气按黄经每15°均匀分布，下标即 黄经 // 15
+SOLAR_TERM_NAMES = tuple(name for _, name in SOLAR_TERMS)
+
+# J2000.0 历元（儒略日 2451545.0）
+_J2000 = datetime.datetime(2000, 1, 1, 12, 0, 0)
+
+# 近似算法的误差约0.01°，距节气交接点小于此值时改用精确算法
+_CUSP_MARGIN_DEG = 0.1
+
 
 def get_solar_term(target_dt: datetime.datetime) -> str:
     """
@@ -32,6 +42,41 @@ def get_solar_term(target_dt: datetime.datetime) -> str:
     Returns:
         str: 节气的中文名称。
     """
+    sun_geocentric_lon_deg = get_sun_geocentric_lon(target_dt)
+
+    # 查找节气：直接由黄经计算下标
+    return SOLAR_TERM_NAMES[int(sun_geocentric_lon_deg // 15) % 24]
+
+
+def get_sun_geocentric_lon(target_dt: datetime.datetime) -> float:
+    """
+    获取给定时间太阳的地心黄经（度，0~360）。
+
+    Args:
+        target_dt (datetime.datetime): 需要查询的日期和时间对象。
+
+    Returns:
+        float: 太阳地心黄经。
+    """
+    earth_heliocentric_lon_deg, _, _ = get_heliocentric_state(target_dt)
+
+    # 太阳的地心经度 = 地球的日心经度 + 180°。
+    return (earth_heliocentric_lon_deg + 180.0) % 360.0
+
+
+def get_heliocentric_state(target_dt: datetime.datetime) -> Tuple[float, float, float]:
+    """
+    获取给定时间地球的日心坐标 (黄经度数, 黄纬度数, 距离AU)。
+
+    计算结果按分钟缓存：节气交接点每年只移动数分钟，秒级精度没有意义。
+    各模块共用同一份缓存，同一时刻的 Epoch/Earth 只构造一次。
+    """
+    return _helio_state(target_dt.replace(second=0, microsecond=0, tzinfo=None))
+
+
+@lru_cache(maxsize=2048)
+def _helio_state(target_dt: datetime.datetime) -> Tuple[float, float, float]:
+    """get_heliocentric_state 的缓存实现，target_dt 已按分钟取整"""
     # 1. 将 Python datetime 转换为 PyPlanets 的 Epoch 对象。
     epoch = Epoch(target_dt.year, target_dt.month, target_dt.day,
                             target_dt.hour, target_dt.minute, target_dt.second)
@@ -43,29 +88,59 @@ def get_solar_term(target_dt: datetime.datetime) -> str:
     l_angle, b_angle, r = earth.geometric_heliocentric_position()
 
     # 4. 【核心修正】根据源码，调用 .rad() 获取弧度值，再用 math.degrees() 转换为度数。
-    earth_heliocentric_lon_rad = l_angle.rad()
-    earth_heliocentric_lon_deg = math.degrees(earth_heliocentric_lon_rad)
+    return math.degrees(l_angle.rad()), math.degrees(b_angle.rad()), float(r)
+
+
+def _approx_sun_longitude(target_dt: datetime.datetime) -> float:
+    """
+    Meeus《天文算法》第25章低精度公式计算太阳地心真黄经（度），误差约0.01°。
+    与 get_solar_term 一致，直接使用 datetime 的各字段，不做时区换算。
+    """
+    days = (target_dt.replace(tzinfo=None) - _J2000).total_seconds() / 86400.0
+    t = days / 36525.0
+    l0 = 280.46646 + 36000.76983 * t + 0.0003032 * t * t
+    m = math.radians(357.52911 + 35999.05029 * t - 0.0001537 * t * t)
+    c = ((1.914602 - 0.004817 * t - 0.000014 * t * t) * math.sin(m)
+         + (0.019993 - 0.000101 * t) * math.sin(2 * m)
+         + 0.000289 * math.sin(3 * m))
+    return (l0 + c) % 360.0
+
 
-    # 5. 太阳的地心经度 = 地球的日心经度 + 180°。
-    sun_geocentric_lon_deg = (earth_heliocentric_lon_deg + 180.0) % 360.0
+def get_solar_terms_batch(datetimes: Sequence[datetime.datetime]) -> List[str]:
+    """
+    批量查询节气，用于一次绘制大量盘面（如全年逐日排盘）的场景。
 
-    # 6. 查找节气
-    current_term_name = None
-    for angle, name in reversed(SOLAR_TERMS):
-        if sun_geocentric_lon_deg >= angle:
-            current_term_name = name
-            break
+    先用低精度公式计算太阳黄经，只有落在节气交接点附近的时间
+    才调用 get_solar_term 做精确计算。
 
-    if current_term_name is None:
-        current_term_name = "春分"
+    Args:
+        datetimes: 需要查询的日期和时间对象序列。
 
-    return current_term_name
+    Returns:
+        List[str]: 与输入顺序一致的节气中文名称列表。
+    """
+    results = []
+    for target_dt in datetimes:
+        lon = _approx_sun_longitude(target_dt)
+        offset = lon % 15.0
+        if offset < _CUSP_MARGIN_DEG or offset > 15.0 - _CUSP_MARGIN_DEG:
+            results.append(get_solar_term(target_dt))
+        else:
+            results.append(SOLAR_TERM_NAMES[int(lon // 15) % 24])
+    return results
 
 
 def get_si_zhu(target_dt: datetime.datetime) -> Dict[str, str]:
     """
     使用 ichingpy 获取四柱。
     """
+    # 返回副本，避免调用方修改缓存中的字典
+    return dict(_si_zhu_cached(target_dt))
+
+
+@lru_cache(maxsize=1024)
+def _si_zhu_cached(target_dt: datetime.datetime) -> Dict[str, str]:
+    """get_si_zhu 的缓存实现（月柱、年柱在节气交接时刻变化，因此按完整时间缓存）"""
     fp = ichingpy.FourPillars.from_datetime(target_dt)
     pillars_str = fp.get_pillars()
     pillars_list = pillars_str.split(' ')
@@ -4,14 +4,79 @@ Project: QMW-CoreApp (Qi Men Workbench - Core Application)
 Task ID: FEAT-20250901-020-Comprehensive (全面首选项系统)
 """
 
-from PySide6.QtCore import QSettings
+from PySide6.QtCore import Qt, QObject, QSettings, QTimer, QCoreApplication, Signal
 from ui.config import DisplayConfig
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 import os
 import json
 
+# orjson为可选依赖：可用时用于五行颜色的序列化，否则使用标准库json
+try:
+    import orjson
 
-class ConfigManager:
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+
+# 盘面显示配置项：(DisplayConfig属性名, QSettings读取类型)
+# wuxing_colors以JSON字符串存储，不在此表中，单独处理
+_DISPLAY_SCHEMA = (
+    # 样式设置
+    ("use_wuxing_colors", bool),
+    ("show_zhi_fu_shi_bold", bool),
+    ("auto_yue_ling_chong_kong", bool),
+    ("auto_maxing_chong_mu_kong", bool),
+    # 参数显示控制
+    ("show_ri_kong", bool),
+    ("show_shi_kong", bool),
+    ("show_liu_ji", bool),
+    ("show_ru_mu", bool),
+    ("show_ma_xing", bool),
+    ("show_yue_ling", bool),
+    ("show_di_pan_gate", bool),
+    ("show_di_pan_star", bool),
+    # 参数状态角标配置
+    ("show_parameter_states", bool),
+    ("show_tiangan_changsheng", bool),
+    ("show_bamen_wangxiang", bool),
+    ("show_jiuxing_wangxiang", bool),
+    ("show_bashen_wangxiang", bool),
+    # 数值配置
+    ("annotation_background_alpha", int),
+    ("selected_border_width", int),
+    ("annotation_circle_radius", int),
+)
+
+# 通用配置项：(键名, 类型, 默认值)
+_GENERAL_SCHEMA = (
+    ("theme", str, "light"),
+    ("language", str, "zh_CN"),
+    ("auto_load_last_workspace", bool, True),
+    ("last_workspace_path", str, ""),
+)
+
+# 数据配置项：(键名, 类型, 默认值)
+_DATA_SCHEMA = (
+    ("default_workspace_path", str, ""),
+    ("auto_save_interval", int, 300),  # 5分钟
+    ("max_recent_files", int, 10),
+    ("cache_enabled", bool, True),
+)
+
+# 默认显示配置（不可变，可直接共享）及其五行颜色的JSON字符串，导入时计算一次
+_DEFAULT_DISPLAY = DisplayConfig()
+_DEFAULT_WUXING_JSON = _json_dumps(_DEFAULT_DISPLAY.wuxing_colors)
+
+# 延迟写盘间隔（毫秒）：此时间内的多次保存合并为一次sync
+_FLUSH_DELAY_MS = 500
+
+
+class ConfigManager(QObject):
     """
     配置管理器 - 使用QSettings对应用程序的所有配置进行本地持久化读写
     
@@ -23,12 +88,145 @@ class ConfigManager:
     5. 提供安全的默认值
     """
     
+    # 信号：启动后延迟读取的显示配置与默认配置不同时发出
+    display_config_loaded = Signal(DisplayConfig)
+    
     def __init__(self):
         """初始化配置管理器"""
-        # 设置组织和应用程序名称，QSettings会自动选择合适的存储位置
-        # Windows: 注册表
-        # macOS/Linux: .ini文件
-        self.settings = QSettings("QiMenWorkbench", "QiMenCore")
+        super().__init__()
+        
+        # 统一使用INI文件存储（Windows下不再读写注册表）
+        self.settings = QSettings(
+            QSettings.IniFormat, QSettings.UserScope, "QiMenWorkbench", "QiMenCore"
+        )
+        
+        # 键值缓存：键为完整路径（含分组），命中时不再访问QSettings
+        self._kv_cache: Dict[str, Any] = {}
+        
+        self._migrate_native_settings()
+        
+        # 内存缓存：避免每次读取都重新访问注册表/INI文件
+        self._display_cache: Optional[DisplayConfig] = None
+        self._general_cache: Optional[Dict[str, Any]] = None
+        self._data_cache: Optional[Dict[str, Any]] = None
+        
+        # 延迟写盘：保存时只启动单次定时器，到期后统一sync一次
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(_FLUSH_DELAY_MS)
+        self._flush_timer.timeout.connect(self.settings.sync)
+        
+        # 程序退出前确保未写盘的修改被写入
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush_now)
+            # 应用程序失去焦点（空闲）时提前写盘；QSettings对象在整个会话中保持打开
+            if hasattr(app, "applicationStateChanged"):
+                app.applicationStateChanged.connect(self._on_application_state_changed)
+        
+    def _migrate_native_settings(self):
+        """INI文件为空时，从旧版本使用的平台默认存储（注册表等）迁移已有配置"""
+        if self.settings.allKeys():
+            return
+        try:
+            native_settings = QSettings("QiMenWorkbench", "QiMenCore")
+            keys = native_settings.allKeys()
+            if not keys:
+                return
+            for key in keys:
+                self.settings.setValue(key, native_settings.value(key))
+            self.settings.sync()
+        except Exception as e:
+            print(f"Warning: Failed to migrate native settings: {e}")
+        
+    def _full_key(self, key: str) -> str:
+        """返回包含当前分组前缀的完整键名"""
+        group = self.settings.group()
+        return f"{group}/{key}" if group else key
+        
+    def _get(self, key: str, default: Any, value_type: Optional[type] = None) -> Any:
+        """读取配置项，优先使用键值缓存"""
+        full_key = self._full_key(key)
+        if full_key in self._kv_cache:
+            return self._kv_cache[full_key]
+        if value_type is None:
+            value = self.settings.value(key, default)
+        else:
+            value = self.settings.value(key, default, type=value_type)
+        self._kv_cache[full_key] = value
+        return value
+        
+    def _set(self, key: str, value: Any):
+        """写入配置项，同时更新键值缓存"""
+        self._kv_cache[self._full_key(key)] = value
+        self.settings.setValue(key, value)
+        
+    def _schedule_sync(self):
+        """安排一次延迟写盘（重复调用会重新计时，从而合并多次写入）"""
+        if QCoreApplication.instance() is None:
+            # 没有事件循环时定时器不会触发，直接写盘
+            self.settings.sync()
+            return
+        self._flush_timer.start()
+        
+    def _on_application_state_changed(self, state):
+        """应用程序切换到非活动状态时，立即写入待保存的配置"""
+        if state != Qt.ApplicationState.ApplicationActive and self._flush_timer.isActive():
+            self.flush_now()
+        
+    def flush_now(self):
+        """立即将所有待写入的配置写入磁盘"""
+        self._flush_timer.stop()
+        self.settings.sync()
+        
+    def _invalidate_caches(self):
+        """清空所有内存缓存，下次读取时重新访问持久化存储"""
+        self._display_cache = None
+        self._general_cache = None
+        self._data_cache = None
+        self._kv_cache.clear()
+        
+    @property
+    def display_config(self) -> DisplayConfig:
+        """盘面显示配置（首次访问时读取持久化存储，之后使用内存缓存）"""
+        return self.load_display_config()
+        
+    @property
+    def general_config(self) -> Dict[str, Any]:
+        """通用配置（首次访问时读取持久化存储，之后使用内存缓存）"""
+        return self.load_general_config()
+        
+    @property
+    def data_config(self) -> Dict[str, Any]:
+        """数据配置（首次访问时读取持久化存储，之后使用内存缓存）"""
+        return self.load_data_config()
+        
+    def get_startup_display_config(self) -> DisplayConfig:
+        """
+        获取用于首次绘制的显示配置
+        
+        缓存为空时立即返回默认配置，并在事件循环开始后再读取持久化存储；
+        读取结果与默认配置不同时发出 display_config_loaded 信号，由界面重新应用。
+        
+        Returns:
+            DisplayConfig: 已缓存的配置或默认配置
+        """
+        if self._display_cache is not None:
+            return self._display_cache
+        if QCoreApplication.instance() is None:
+            # 没有事件循环，无法延迟读取
+            return self.load_display_config()
+        QTimer.singleShot(0, self._populate_display_cache)
+        return _DEFAULT_DISPLAY
+        
+    def _populate_display_cache(self):
+        """延迟读取显示配置，与默认配置不同时通知界面"""
+        if self._display_cache is not None:
+            # 已被其他调用方读取过，界面早已拿到真实配置
+            return
+        config = self.load_display_config()
+        if config != _DEFAULT_DISPLAY:
+            self.display_config_loaded.emit(config)
         
     def load_config(self) -> DisplayConfig:
         """
@@ -40,6 +238,23 @@ class ConfigManager:
         """
         return self.load_display_config()
         
+    @staticmethod
+    def _parse_wuxing_colors(raw: Any) -> Dict[str, str]:
+        """解析存储的五行颜色JSON，缺失的五行补默认值，无法解析时返回默认颜色"""
+        default_colors = _DEFAULT_DISPLAY.wuxing_colors
+        if not isinstance(raw, str):
+            return default_colors
+        try:
+            wuxing_colors = _json_loads(raw)
+        except ValueError:
+            return default_colors
+        if not isinstance(wuxing_colors, dict):
+            return default_colors
+        # 确保包含所有五行
+        for wuxing, color in default_colors.items():
+            wuxing_colors.setdefault(wuxing, color)
+        return wuxing_colors
+        
     def load_display_config(self) -> DisplayConfig:
         """
         从持久化存储中读取盘面显示配置，构建并返回DisplayConfig对象
@@ -47,179 +262,36 @@ class ConfigManager:
         Returns:
             DisplayConfig: 配置对象，如果某项不存在则使用默认值
         """
-        # 创建默认配置作为基准
-        default_config = DisplayConfig()
+        if self._display_cache is not None:
+            return self._display_cache
+
+        # 默认配置作为基准（模块级只读模板）
+        default_config = _DEFAULT_DISPLAY
         
+        self.settings.beginGroup("display")
         try:
-            # 样式设置
-            use_wuxing_colors = self.settings.value(
-                "display/use_wuxing_colors", 
-                default_config.use_wuxing_colors, 
-                type=bool
-            )
-            
-            show_zhi_fu_shi_bold = self.settings.value(
-                "display/show_zhi_fu_shi_bold", 
-                default_config.show_zhi_fu_shi_bold, 
-                type=bool
-            )
-            
-            auto_yue_ling_chong_kong = self.settings.value(
-                "display/auto_yue_ling_chong_kong", 
-                default_config.auto_yue_ling_chong_kong, 
-                type=bool
-            )
-            
-            auto_maxing_chong_mu_kong = self.settings.value(
-                "display/auto_maxing_chong_mu_kong", 
-                default_config.auto_maxing_chong_mu_kong, 
-                type=bool
-            )
-            
-            # 参数显示控制
-            show_ri_kong = self.settings.value(
-                "display/show_ri_kong", 
-                default_config.show_ri_kong, 
-                type=bool
-            )
-            
-            show_shi_kong = self.settings.value(
-                "display/show_shi_kong", 
-                default_config.show_shi_kong, 
-                type=bool
-            )
-            
-            show_liu_ji = self.settings.value(
-                "display/show_liu_ji", 
-                default_config.show_liu_ji, 
-                type=bool
-            )
-            
-            show_ru_mu = self.settings.value(
-                "display/show_ru_mu", 
-                default_config.show_ru_mu, 
-                type=bool
-            )
-            
-            show_ma_xing = self.settings.value(
-                "display/show_ma_xing", 
-                default_config.show_ma_xing, 
-                type=bool
-            )
-            
-            show_yue_ling = self.settings.value(
-                "display/show_yue_ling", 
-                default_config.show_yue_ling, 
-                type=bool
-            )
-            
-            show_di_pan_gate = self.settings.value(
-                "display/show_di_pan_gate", 
-                default_config.show_di_pan_gate, 
-                type=bool
-            )
-            
-            show_di_pan_star = self.settings.value(
-                "display/show_di_pan_star", 
-                default_config.show_di_pan_star, 
-                type=bool
-            )
-            
-            # 参数状态角标配置（新增）
-            show_parameter_states = self.settings.value(
-                "display/show_parameter_states", 
-                default_config.show_parameter_states, 
-                type=bool
-            )
-            
-            show_tiangan_changsheng = self.settings.value(
-                "display/show_tiangan_changsheng", 
-                default_config.show_tiangan_changsheng, 
-                type=bool
-            )
-            
-            show_bamen_wangxiang = self.settings.value(
-                "display/show_bamen_wangxiang", 
-                default_config.show_bamen_wangxiang, 
-                type=bool
-            )
-            
-            show_jiuxing_wangxiang = self.settings.value(
-                "display/show_jiuxing_wangxiang", 
-                default_config.show_jiuxing_wangxiang, 
-                type=bool
-            )
-            
-            show_bashen_wangxiang = self.settings.value(
-                "display/show_bashen_wangxiang", 
-                default_config.show_bashen_wangxiang, 
-                type=bool
-            )
-            
-            # 数值配置
-            annotation_background_alpha = self.settings.value(
-                "display/annotation_background_alpha", 
-                default_config.annotation_background_alpha, 
-                type=int
-            )
-            
-            selected_border_width = self.settings.value(
-                "display/selected_border_width", 
-                default_config.selected_border_width, 
-                type=int
-            )
-            
-            annotation_circle_radius = self.settings.value(
-                "display/annotation_circle_radius", 
-                default_config.annotation_circle_radius, 
-                type=int
-            )
+            values = {
+                attr: self._get(attr, getattr(default_config, attr), value_type)
+                for attr, value_type in _DISPLAY_SCHEMA
+            }
             
-            # 加载五行颜色配置 (新增)
-            wuxing_colors_str = self.settings.value(
-                "display/wuxing_colors",
-                json.dumps(default_config.wuxing_colors)
+            # 加载五行颜色配置（JSON字符串，需单独处理）
+            values["wuxing_colors"] = self._parse_wuxing_colors(
+                self._get("wuxing_colors", _DEFAULT_WUXING_JSON)
             )
-            try:
-                wuxing_colors = json.loads(wuxing_colors_str) if isinstance(wuxing_colors_str, str) else default_config.wuxing_colors
-                # 确保包含所有五行
-                for wuxing in ["金", "木", "水", "火", "土"]:
-                    if wuxing not in wuxing_colors:
-                        wuxing_colors[wuxing] = default_config.wuxing_colors[wuxing]
-            except (json.JSONDecodeError, TypeError):
-                wuxing_colors = default_config.wuxing_colors
             
             # 构建配置对象
-            config = DisplayConfig(
-                use_wuxing_colors=use_wuxing_colors,
-                show_zhi_fu_shi_bold=show_zhi_fu_shi_bold,
-                auto_yue_ling_chong_kong=auto_yue_ling_chong_kong,
-                auto_maxing_chong_mu_kong=auto_maxing_chong_mu_kong,
-                show_ri_kong=show_ri_kong,
-                show_shi_kong=show_shi_kong,
-                show_liu_ji=show_liu_ji,
-                show_ru_mu=show_ru_mu,
-                show_ma_xing=show_ma_xing,
-                show_yue_ling=show_yue_ling,
-                show_di_pan_gate=show_di_pan_gate,
-                show_di_pan_star=show_di_pan_star,
-                show_parameter_states=show_parameter_states,  # 新增
-                show_tiangan_changsheng=show_tiangan_changsheng,  # 新增
-                show_bamen_wangxiang=show_bamen_wangxiang,  # 新增
-                show_jiuxing_wangxiang=show_jiuxing_wangxiang,  # 新增
-                show_bashen_wangxiang=show_bashen_wangxiang,  # 新增
-                wuxing_colors=wuxing_colors,  # 新增
-                annotation_background_alpha=annotation_background_alpha,
-                selected_border_width=selected_border_width,
-                annotation_circle_radius=annotation_circle_radius
-            )
+            config = DisplayConfig(**values)
             
+            self._display_cache = config
             return config
             
         except Exception as e:
             # 如果读取配置时出现任何错误，返回默认配置
             print(f"Warning: Failed to load config, using defaults: {e}")
             return default_config
+        finally:
+            self.settings.endGroup()
     
     def save_config(self, config: DisplayConfig) -> bool:
         """
@@ -245,46 +317,30 @@ class ConfigManager:
             bool: 保存是否成功
         """
         try:
-            # 样式设置
-            self.settings.setValue("display/use_wuxing_colors", config.use_wuxing_colors)
-            self.settings.setValue("display/show_zhi_fu_shi_bold", config.show_zhi_fu_shi_bold)
-            self.settings.setValue("display/auto_yue_ling_chong_kong", config.auto_yue_ling_chong_kong)
-            self.settings.setValue("display/auto_maxing_chong_mu_kong", config.auto_maxing_chong_mu_kong)
-            
-            # 参数显示控制
-            self.settings.setValue("display/show_ri_kong", config.show_ri_kong)
-            self.settings.setValue("display/show_shi_kong", config.show_shi_kong)
-            self.settings.setValue("display/show_liu_ji", config.show_liu_ji)
-            self.settings.setValue("display/show_ru_mu", config.show_ru_mu)
-            self.settings.setValue("display/show_ma_xing", config.show_ma_xing)
-            self.settings.setValue("display/show_yue_ling", config.show_yue_ling)
-            self.settings.setValue("display/show_di_pan_gate", config.show_di_pan_gate)
-            self.settings.setValue("display/show_di_pan_star", config.show_di_pan_star)
-            
-            # 参数状态角标配置（新增）
-            self.settings.setValue("display/show_parameter_states", config.show_parameter_states)
-            self.settings.setValue("display/show_tiangan_changsheng", config.show_tiangan_changsheng)
-            self.settings.setValue("display/show_bamen_wangxiang", config.show_bamen_wangxiang)
-            self.settings.setValue("display/show_jiuxing_wangxiang", config.show_jiuxing_wangxiang)
-            self.settings.setValue("display/show_bashen_wangxiang", config.show_bashen_wangxiang)
+            self._write_display_config(config)
             
-            # 数值配置
-            self.settings.setValue("display/annotation_background_alpha", config.annotation_background_alpha)
-            self.settings.setValue("display/selected_border_width", config.selected_border_width)
-            self.settings.setValue("display/annotation_circle_radius", config.annotation_circle_radius)
-            
-            # 保存五行颜色配置 (新增)
-            self.settings.setValue("display/wuxing_colors", json.dumps(config.wuxing_colors))
-            
-            # 确保配置写入磁盘
-            self.settings.sync()
+            # 安排延迟写盘
+            self._schedule_sync()
             
+            self._display_cache = config
             return True
             
         except Exception as e:
             print(f"Error: Failed to save config: {e}")
             return False
     
+    def _write_display_config(self, config: DisplayConfig):
+        """将显示配置写入display分组（不执行sync）"""
+        self.settings.beginGroup("display")
+        try:
+            for attr, _value_type in _DISPLAY_SCHEMA:
+                self._set(attr, getattr(config, attr))
+            
+            # 保存五行颜色配置 (新增)
+            self._set("wuxing_colors", _json_dumps(config.wuxing_colors))
+        finally:
+            self.settings.endGroup()
+    
     def reset_to_defaults(self) -> DisplayConfig:
         """
         重置所有配置为默认值
@@ -292,6 +348,7 @@ class ConfigManager:
         Returns:
             DisplayConfig: 默认配置对象
         """
+        self._invalidate_caches()
         default_config = DisplayConfig()
         self.save_config(default_config)
         return default_config
@@ -318,26 +375,22 @@ class ConfigManager:
         Returns:
             Dict: 通用配置字典
         """
+        if self._general_cache is not None:
+            return self._general_cache.copy()
+        
+        self.settings.beginGroup("general")
         try:
             config = {
-                "theme": self.settings.value("general/theme", "light", type=str),
-                "language": self.settings.value("general/language", "zh_CN", type=str),
-                "auto_load_last_workspace": self.settings.value(
-                    "general/auto_load_last_workspace", True, type=bool
-                ),
-                "last_workspace_path": self.settings.value(
-                    "general/last_workspace_path", "", type=str
-                )
+                key: self._get(key, default, value_type)
+                for key, value_type, default in _GENERAL_SCHEMA
             }
-            return config
+            self._general_cache = config
+            return config.copy()
         except Exception as e:
             print(f"Warning: Failed to load general config, using defaults: {e}")
-            return {
-                "theme": "light",
-                "language": "zh_CN", 
-                "auto_load_last_workspace": True,
-                "last_workspace_path": ""
-            }
+            return {key: default for key, _value_type, default in _GENERAL_SCHEMA}
+        finally:
+            self.settings.endGroup()
     
     def save_general_config(self, config: Dict[str, Any]) -> bool:
         """
@@ -350,20 +403,25 @@ class ConfigManager:
             bool: 保存是否成功
         """
         try:
-            self.settings.setValue("general/theme", config.get("theme", "light"))
-            self.settings.setValue("general/language", config.get("language", "zh_CN"))
-            self.settings.setValue("general/auto_load_last_workspace", 
-                                 config.get("auto_load_last_workspace", True))
-            self.settings.setValue("general/last_workspace_path", 
-                                 config.get("last_workspace_path", ""))
+            self._write_general_config(config)
             
-            self.settings.sync()
+            self._schedule_sync()
+            self._general_cache = None
             return True
             
         except Exception as e:
             print(f"Error: Failed to save general config: {e}")
             return False
     
+    def _write_general_config(self, config: Dict[str, Any]):
+        """将通用配置写入general分组（不执行sync）"""
+        self.settings.beginGroup("general")
+        try:
+            for key, _value_type, default in _GENERAL_SCHEMA:
+                self._set(key, config.get(key, default))
+        finally:
+            self.settings.endGroup()
+    
     def load_data_config(self) -> Dict[str, Any]:
         """
         加载数据配置(默认工作区路径、缓存设置等)
@@ -371,30 +429,22 @@ class ConfigManager:
         Returns:
             Dict: 数据配置字典
         """
+        if self._data_cache is not None:
+            return self._data_cache.copy()
+        
+        self.settings.beginGroup("data")
         try:
             config = {
-                "default_workspace_path": self.settings.value(
-                    "data/default_workspace_path", "", type=str
-                ),
-                "auto_save_interval": self.settings.value(
-                    "data/auto_save_interval", 300, type=int  # 5分钟
-                ),
-                "max_recent_files": self.settings.value(
-                    "data/max_recent_files", 10, type=int
-                ),
-                "cache_enabled": self.settings.value(
-                    "data/cache_enabled", True, type=bool
-                )
+                key: self._get(key, default, value_type)
+                for key, value_type, default in _DATA_SCHEMA
             }
-            return config
+            self._data_cache = config
+            return config.copy()
         except Exception as e:
             print(f"Warning: Failed to load data config, using defaults: {e}")
-            return {
-                "default_workspace_path": "",
-                "auto_save_interval": 300,
-                "max_recent_files": 10,
-                "cache_enabled": True
-            }
+            return {key: default for key, _value_type, default in _DATA_SCHEMA}
+        finally:
+            self.settings.endGroup()
     
     def save_data_config(self, config: Dict[str, Any]) -> bool:
         """
@@ -407,22 +457,54 @@ class ConfigManager:
             bool: 保存是否成功
         """
         try:
-            self.settings.setValue("data/default_workspace_path", 
-                                 config.get("default_workspace_path", ""))
-            self.settings.setValue("data/auto_save_interval", 
-                                 config.get("auto_save_interval", 300))
-            self.settings.setValue("data/max_recent_files", 
-                                 config.get("max_recent_files", 10))
-            self.settings.setValue("data/cache_enabled", 
-                                 config.get("cache_enabled", True))
+            self._write_data_config(config)
             
-            self.settings.sync()
+            self._schedule_sync()
+            self._data_cache = None
             return True
             
         except Exception as e:
             print(f"Error: Failed to save data config: {e}")
             return False
     
+    def _write_data_config(self, config: Dict[str, Any]):
+        """将数据配置写入data分组（不执行sync）"""
+        self.settings.beginGroup("data")
+        try:
+            for key, _value_type, default in _DATA_SCHEMA:
+                self._set(key, config.get(key, default))
+        finally:
+            self.settings.endGroup()
+    
+    def save_all(self, display_config: DisplayConfig, general_config: Dict[str, Any],
+                 data_config: Dict[str, Any]) -> bool:
+        """
+        一次性保存显示、通用和数据三部分配置，最后只安排一次写盘
+        
+        Args:
+            display_config: 显示配置对象
+            general_config: 通用配置字典
+            data_config: 数据配置字典
+            
+        Returns:
+            bool: 保存是否成功
+        """
+        try:
+            self._write_display_config(display_config)
+            self._write_general_config(general_config)
+            self._write_data_config(data_config)
+            
+            self._schedule_sync()
+            
+            self._display_cache = display_config
+            self._general_cache = None
+            self._data_cache = None
+            return True
+            
+        except Exception as e:
+            print(f"Error: Failed to save configs: {e}")
+            return False
+    
     def get_config_file_path(self) -> str:
         """
         获取配置文件的路径（用于"打开配置文件夹"功能）
@@ -445,8 +527,28 @@ class ConfigManager:
         """
         try:
             self.settings.clear()
-            self.settings.sync()
+            self.flush_now()
+            self._invalidate_caches()
             return True
         except Exception as e:
             print(f"Error: Failed to clear configs: {e}")
             return False
+
+
+# 进程级共享的配置管理器实例
+_config_manager: Optional[ConfigManager] = None
+
+
+def get_config_manager() -> ConfigManager:
+    """
+    获取进程内共享的配置管理器
+    
+    所有窗口共用同一个QSettings对象和内存缓存，避免重复打开配置存储。
+    
+    Returns:
+        ConfigManager: 共享的配置管理器实例
+    """
+    global _config_manager
+    if _config_manager is None:
+        _config_manager = ConfigManager()
+    return _config_manager
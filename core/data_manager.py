@@ -8,14 +8,59 @@ Task ID: FEAT-20250901-019
 
 import sqlite3
 import json
+import hashlib
 from datetime import datetime
 from typing import List, Optional
 import os
+import threading
 from datetime import datetime
 from typing import List, Dict, Optional
 from .models import Case, ChartResult
 
 
+# orjson为可选依赖：可用时用于案例数据的序列化/反序列化，否则使用标准库json
+# 两者输出相同的紧凑UTF-8 JSON，已保存的文件可以互相读取
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+    _json_loads = json.loads
+
+
+# 每个连接打开后执行的PRAGMA（journal_mode=WAL 持久保存在文件中，只需在初始化时设置一次）
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA busy_timeout=5000",
+)
+
+# 数据库架构版本，记录在 PRAGMA user_version 中
+# V2: 增加querent、details列；V3: 增加creation_time索引
+_SCHEMA_VERSION = 3
+
+# 插入/更新案例的SQL（save_case 与 save_cases 共用）
+# sqlite3 按SQL文本在连接上缓存已编译的语句，DataManager 复用同一连接，
+# 因此这些语句只在第一次执行时编译；连接的使用由 self._lock 串行化
+_INSERT_CASE_SQL = '''
+    INSERT INTO cases (name, querent, details, creation_time, query_time, chart_result_json, annotation_layers_json)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+_UPDATE_CASE_SQL = '''
+    UPDATE cases 
+    SET name = ?, querent = ?, details = ?, query_time = ?, chart_result_json = ?, annotation_layers_json = ?
+    WHERE id = ?
+'''
+
+
 class DataManager:
     """数据访问层 - 管理案例的持久化存储"""
     
@@ -27,60 +72,87 @@ class DataManager:
             db_path: 数据库文件路径（.qmw文件）
         """
         self.db_path = db_path
-        self.create_tables()
-        self._upgrade_database_schema()  # 确保数据库架构是最新的
+        # 整个生命周期复用同一个连接，避免每次调用都重新打开数据库
+        self._lock = threading.RLock()
+        self._conn = self._connect()
+        self._enable_wal()
+        self._ensure_schema()  # 确保数据库架构是最新的
     
-    def create_tables(self):
-        """创建数据库表结构"""
+    def _connect(self) -> sqlite3.Connection:
+        """打开数据库连接并应用性能相关的PRAGMA设置"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def _enable_wal(self):
+        """将数据库切换为WAL日志模式（设置保存在数据库文件中）"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # 创建cases表
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS cases (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        name TEXT NOT NULL,
-                        querent TEXT DEFAULT '',
-                        details TEXT DEFAULT '',
-                        creation_time TEXT NOT NULL,
-                        query_time TEXT NOT NULL,
-                        chart_result_json TEXT NOT NULL,
-                        annotation_layers_json TEXT NOT NULL,
-                        duan_yu_markdown TEXT,
-                        feedback_text TEXT
-                    )
-                ''')
-                
-                conn.commit()
-                
+            with self._lock:
+                self._conn.execute("PRAGMA journal_mode=WAL")
         except sqlite3.Error as e:
-            print(f"创建数据库表失败: {e}")
-            raise
+            print(f"启用WAL模式失败: {e}")
+            # 不抛出异常，使用默认日志模式继续运行
     
-    def _upgrade_database_schema(self):
-        """升级数据库架构到V2版本"""
+    def _ensure_schema(self):
+        """
+        按 PRAGMA user_version 判断是否需要建表/升级数据库架构
+        
+        已是最新版本时直接返回；否则在同一个事务中完成建表、升级并写入版本号
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._conn as conn:
                 cursor = conn.cursor()
                 
-                # 检查是否存在V2字段，如果不存在则添加
-                cursor.execute("PRAGMA table_info(cases)")
-                columns = [column[1] for column in cursor.fetchall()]
+                cursor.execute("PRAGMA user_version")
+                if cursor.fetchone()[0] >= _SCHEMA_VERSION:
+                    return
                 
-                if 'querent' not in columns:
-                    print("升级数据库架构：添加querent列")
-                    cursor.execute("ALTER TABLE cases ADD COLUMN querent TEXT DEFAULT ''")
-                
-                if 'details' not in columns:
-                    print("升级数据库架构：添加details列")
-                    cursor.execute("ALTER TABLE cases ADD COLUMN details TEXT DEFAULT ''")
-                    
-                conn.commit()
+                cursor.execute("BEGIN")
+                self._create_tables(cursor)
+                self._upgrade_database_schema(cursor)
+                cursor.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
                 
         except sqlite3.Error as e:
-            print(f"数据库架构升级失败: {e}")
-            # 不抛出异常，允许继续运行
+            print(f"初始化数据库架构失败: {e}")
+            raise
+    
+    def _create_tables(self, cursor: sqlite3.Cursor):
+        """创建数据库表结构"""
+        # 创建cases表
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS cases (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                querent TEXT DEFAULT '',
+                details TEXT DEFAULT '',
+                creation_time TEXT NOT NULL,
+                query_time TEXT NOT NULL,
+                chart_result_json TEXT NOT NULL,
+                annotation_layers_json TEXT NOT NULL,
+                duan_yu_markdown TEXT,
+                feedback_text TEXT
+            )
+        ''')
+        
+        # 案例列表按创建时间倒序显示，建立索引避免每次全表排序
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_cases_creation_time ON cases(creation_time DESC)
+        ''')
+    
+    def _upgrade_database_schema(self, cursor: sqlite3.Cursor):
+        """升级数据库架构到V2版本"""
+        # 检查是否存在V2字段，如果不存在则添加
+        cursor.execute("PRAGMA table_info(cases)")
+        columns = [column[1] for column in cursor.fetchall()]
+        
+        if 'querent' not in columns:
+            print("升级数据库架构：添加querent列")
+            cursor.execute("ALTER TABLE cases ADD COLUMN querent TEXT DEFAULT ''")
+        
+        if 'details' not in columns:
+            print("升级数据库架构：添加details列")
+            cursor.execute("ALTER TABLE cases ADD COLUMN details TEXT DEFAULT ''")
     
     def save_case(self, case: Case) -> int:
         """
@@ -99,46 +171,116 @@ class DataManager:
             current_time = datetime.now().isoformat()
             
             # 序列化ChartResult
-            chart_result_json = json.dumps(case.chart_result.to_dict(), ensure_ascii=False, indent=2)
+            chart_result_json = _json_dumps(case.chart_result.to_dict())
             
-            # 序列化标注图层
-            annotation_layers_json = json.dumps(case.annotation_layers, ensure_ascii=False, indent=2)
+            # 序列化标注图层（图层未变化时复用上次结果）
+            annotation_layers_json = self._serialize_layers(case)
             
             # 从ChartResult中提取起局时间
             query_time = case.chart_result.qi_ju_time or current_time
             
-            with sqlite3.connect(self.db_path) as conn:
+            # 案例内容与上次保存时完全一致则无需写入
+            saved_hash = self._case_hash(case, chart_result_json, annotation_layers_json)
+            if case.id is not None and case.saved_hash == saved_hash:
+                return case.id
+            
+            # 序列化在打开写事务之前完成，缩短事务持有时间
+            with self._lock, self._conn as conn:
                 cursor = conn.cursor()
                 
                 if case.id is None:
                     # 新案例 - 插入
-                    cursor.execute('''
-                        INSERT INTO cases (name, querent, details, creation_time, query_time, chart_result_json, annotation_layers_json)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (case.title, case.querent, case.details, current_time, query_time, chart_result_json, annotation_layers_json))
+                    cursor.execute(_INSERT_CASE_SQL, (case.title, case.querent, case.details, current_time, query_time, chart_result_json, annotation_layers_json))
                     
                     case_id = cursor.lastrowid
                     case.id = case_id
                 else:
                     # 现有案例 - 更新
-                    cursor.execute('''
-                        UPDATE cases 
-                        SET name = ?, querent = ?, details = ?, query_time = ?, chart_result_json = ?, annotation_layers_json = ?
-                        WHERE id = ?
-                    ''', (case.title, case.querent, case.details, query_time, chart_result_json, annotation_layers_json, case.id))
+                    cursor.execute(_UPDATE_CASE_SQL, (case.title, case.querent, case.details, query_time, chart_result_json, annotation_layers_json, case.id))
                     
                     case_id = case.id
                 
                 conn.commit()
+                case.saved_hash = saved_hash
                 return case_id
                 
         except sqlite3.Error as e:
             print(f"保存案例失败: {e}")
             raise Exception(f"保存案例失败: {e}")
-        except json.JSONEncodeError as e:
+        except (TypeError, ValueError) as e:
             print(f"序列化案例数据失败: {e}")
             raise Exception(f"序列化案例数据失败: {e}")
     
+    def save_cases(self, cases: List[Case]) -> List[int]:
+        """
+        在一个事务中批量保存多个案例（用于导入、批量复制等场景）
+        
+        Args:
+            cases: 要保存的案例对象列表
+            
+        Returns:
+            List[int]: 与输入顺序一致的案例ID列表
+            
+        Raises:
+            Exception: 保存失败时抛出异常，整批保存回滚
+        """
+        try:
+            current_time = datetime.now().isoformat()
+            
+            new_rows = []
+            update_rows = []
+            hashes = []
+            for case in cases:
+                chart_result_json = _json_dumps(case.chart_result.to_dict())
+                annotation_layers_json = self._serialize_layers(case)
+                query_time = case.chart_result.qi_ju_time or current_time
+                
+                hashes.append(self._case_hash(case, chart_result_json, annotation_layers_json))
+                
+                if case.id is None:
+                    new_rows.append((case, (case.title, case.querent, case.details, current_time, query_time, chart_result_json, annotation_layers_json)))
+                else:
+                    update_rows.append((case.title, case.querent, case.details, query_time, chart_result_json, annotation_layers_json, case.id))
+            
+            new_ids = []
+            with self._lock, self._conn as conn:
+                cursor = conn.cursor()
+                
+                # 插入需要逐条取得lastrowid，语句本身由sqlite3缓存复用
+                for case, params in new_rows:
+                    cursor.execute(_INSERT_CASE_SQL, params)
+                    new_ids.append((case, cursor.lastrowid))
+                
+                if update_rows:
+                    cursor.executemany(_UPDATE_CASE_SQL, update_rows)
+            
+            # 事务提交成功后再回填新案例的ID
+            for case, case_id in new_ids:
+                case.id = case_id
+            for case, saved_hash in zip(cases, hashes):
+                case.saved_hash = saved_hash
+            
+            return [case.id for case in cases]
+            
+        except sqlite3.Error as e:
+            print(f"批量保存案例失败: {e}")
+            raise Exception(f"批量保存案例失败: {e}")
+        except (TypeError, ValueError) as e:
+            print(f"序列化案例数据失败: {e}")
+            raise Exception(f"序列化案例数据失败: {e}")
+    
+    def _case_hash(self, case: Case, chart_result_json: str, annotation_layers_json: str) -> bytes:
+        """计算案例保存内容的摘要（包含数据库路径，另存为其他文件时不会被误判为未变化）"""
+        parts = (self.db_path, case.title, case.querent, case.details, chart_result_json, annotation_layers_json)
+        content = "\0".join(str(part) for part in parts)
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+    
+    def _serialize_layers(self, case: Case) -> str:
+        """序列化案例的标注图层，图层自上次序列化后未变化时直接复用缓存"""
+        if case.serialized_layers is None:
+            case.serialized_layers = _json_dumps(case.annotation_layers)
+        return case.serialized_layers
+    
     def load_case(self, case_id: int) -> Optional[Case]:
         """
         从数据库加载案例
@@ -150,7 +292,7 @@ class DataManager:
             Case: 加载的案例对象，如果不存在则返回None
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._conn as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute('''
@@ -162,28 +304,7 @@ class DataManager:
                 if not row:
                     return None
                 
-                # 解析数据
-                case_id, name, querent, details, creation_time, query_time, chart_result_json, annotation_layers_json = row
-                
-                # 反序列化ChartResult
-                chart_result_data = json.loads(chart_result_json)
-                chart_result = ChartResult.from_dict(chart_result_data)
-                
-                # 创建Case对象
-                case = Case(name, chart_result)
-                case.id = case_id
-                case.querent = querent
-                case.details = details
-                case.filepath = self.db_path  # 设置案例关联的文件路径
-                
-                # 反序列化标注图层
-                case.annotation_layers = json.loads(annotation_layers_json)
-                
-                # 确保有激活图层
-                if case.annotation_layers and case.active_layer_index == -1:
-                    case.active_layer_index = 0
-                
-                return case
+                return self._row_to_case(row)
                 
         except sqlite3.Error as e:
             print(f"加载案例失败: {e}")
@@ -192,6 +313,40 @@ class DataManager:
             print(f"反序列化案例数据失败: {e}")
             return None
     
+    def _row_to_case(self, row) -> Case:
+        """
+        将cases表的一行数据解码为Case对象
+        
+        Args:
+            row: (id, name, querent, details, creation_time, query_time, chart_result_json, annotation_layers_json)
+            
+        Returns:
+            Case: 解码后的案例对象
+        """
+        # 解析数据
+        case_id, name, querent, details, creation_time, query_time, chart_result_json, annotation_layers_json = row
+        
+        # 反序列化ChartResult
+        chart_result_data = _json_loads(chart_result_json)
+        chart_result = ChartResult.from_dict(chart_result_data)
+        
+        # 创建Case对象
+        case = Case(name, chart_result)
+        case.id = case_id
+        case.querent = querent
+        case.details = details
+        case.filepath = self.db_path  # 设置案例关联的文件路径
+        
+        # 标注图层延迟到首次访问时再反序列化（图层面板可能从未打开）
+        case.set_serialized_layers(annotation_layers_json, _json_loads)
+        case.saved_hash = self._case_hash(case, chart_result_json, annotation_layers_json)
+        
+        # 确保有激活图层
+        if case.active_layer_index == -1 and case.annotation_layers:
+            case.active_layer_index = 0
+        
+        return case
+    
     def load_all_cases(self) -> List[Case]:
         """
         加载数据库中的所有案例
@@ -201,12 +356,22 @@ class DataManager:
         """
         try:
             cases = []
-            cases_summary = self.get_all_cases_summary()
             
-            for case_info in cases_summary:
-                case = self.load_case(case_info['id'])
-                if case:
-                    cases.append(case)
+            # 一次查询取出所有案例，避免逐个按ID查询
+            with self._lock, self._conn as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute('''
+                    SELECT id, name, querent, details, creation_time, query_time, chart_result_json, annotation_layers_json
+                    FROM cases
+                    ORDER BY creation_time DESC
+                ''')
+                
+                for row in cursor:
+                    try:
+                        cases.append(self._row_to_case(row))
+                    except json.JSONDecodeError as e:
+                        print(f"反序列化案例数据失败 (ID: {row[0]}): {e}")
                     
             return cases
             
@@ -219,14 +384,17 @@ class DataManager:
         获取所有案例的摘要信息
         
         Returns:
-            List[Dict]: 案例摘要列表，格式为 [{'id': int, 'name': str, 'query_time': str, 'creation_time': str}, ...]
+            List[Dict]: 案例摘要列表，格式为 [{'id': int, 'name': str, 'querent': str, 'query_time': str, 'creation_time': str}, ...]
+            
+        Note:
+            不包含可能很长的details字段，需要时使用 get_case_details 单独获取
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._conn as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute('''
-                    SELECT id, name, querent, details, query_time, creation_time
+                    SELECT id, name, querent, query_time, creation_time
                     FROM cases
                     ORDER BY creation_time DESC
                 ''')
@@ -237,9 +405,8 @@ class DataManager:
                         'id': row[0],
                         'name': row[1],
                         'querent': row[2],
-                        'details': row[3],
-                        'query_time': row[4],
-                        'creation_time': row[5]
+                        'query_time': row[3],
+                        'creation_time': row[4]
                     }
                     for row in rows
                 ]
@@ -248,6 +415,29 @@ class DataManager:
             print(f"获取案例摘要失败: {e}")
             return []
     
+    def get_case_details(self, case_id: int) -> Optional[str]:
+        """
+        获取指定案例的详情文本
+        
+        Args:
+            case_id: 案例ID
+            
+        Returns:
+            str: 案例详情，如果案例不存在则返回None
+        """
+        try:
+            with self._lock, self._conn as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute('SELECT details FROM cases WHERE id = ?', (case_id,))
+                
+                row = cursor.fetchone()
+                return row[0] if row else None
+                
+        except sqlite3.Error as e:
+            print(f"获取案例详情失败: {e}")
+            return None
+    
     def delete_case(self, case_id: int) -> bool:
         """
         删除指定的案例
@@ -259,7 +449,7 @@ class DataManager:
             bool: 删除成功返回True，失败返回False
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._conn as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute('DELETE FROM cases WHERE id = ?', (case_id,))
@@ -275,6 +465,13 @@ class DataManager:
             print(f"删除案例失败: {e}")
             return False
     
+    def close(self):
+        """关闭数据库连接（应用退出或不再使用该文件时调用）"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
     def get_database_info(self) -> Dict:
         """
         获取数据库信息
@@ -283,16 +480,18 @@ class DataManager:
             Dict: 包含数据库文件信息的字典
         """
         try:
-            file_size = os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0
-            
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._conn as conn:
                 cursor = conn.cursor()
                 cursor.execute('SELECT COUNT(*) FROM cases')
                 case_count = cursor.fetchone()[0]
+                
+                # WAL模式下主文件大小不含尚未回写的页，按数据库页数计算实际大小
+                page_count = cursor.execute('PRAGMA page_count').fetchone()[0]
+                page_size = cursor.execute('PRAGMA page_size').fetchone()[0]
             
             return {
                 'db_path': self.db_path,
-                'file_size': file_size,
+                'file_size': page_count * page_size,
                 'case_count': case_count,
                 'exists': os.path.exists(self.db_path)
             }
@@ -1,7 +1,59 @@
-from typing import List, Dict, Union, Optional
+from collections import namedtuple
+from typing import Any, Callable, List, Dict, Union, Optional
+
+
+class IndexEntry(namedtuple('IndexEntry', ['palace_index', 'param_type', 'attribute_name', 'text', 'sub_index'])):
+    """反向查询索引中的一条落点记录（轻量元组，字符串ID按需生成）"""
+    __slots__ = ()
+
+    @property
+    def id(self) -> tuple:
+        """唯一标识元组 (宫位索引, 属性名, 子索引)，可直接用作字典键"""
+        return (self.palace_index, self.attribute_name, self.sub_index)
+
+    @property
+    def id_str(self) -> str:
+        """字符串形式的参数ID (e.g., "palace_7_tian_pan_stem_0")，与界面和标注数据使用的ID一致"""
+        if self.sub_index is not None:
+            return f"palace_{self.palace_index}_{self.attribute_name}_{self.sub_index}"
+        return f"palace_{self.palace_index}_{self.attribute_name}"
+
+    def to_dict(self) -> dict:
+        """转换为字典格式（用于 special_params 等需要序列化的场景）"""
+        location = {
+            "palace_index": self.palace_index,
+            "param_type": self.param_type,
+            "attribute_name": self.attribute_name,
+            "text": self.text,
+            "id": self.id_str
+        }
+        if self.sub_index is not None:
+            location["sub_index"] = self.sub_index
+        return location
+
+
+# 反向查询索引的构建规则：(Palace属性名, 参数类型, 索引中的attribute_name, 是否为列表)
+# 顺序即同一参数多个落点在索引列表中的顺序
+_INDEX_SPEC = (
+    ('zhi_fu', 'baShen', 'zhi_fu', False),                   # 八神
+    ('tian_pan_stars', 'jiuXing', 'tian_pan_stars', True),   # 天盘星
+    ('tian_pan_gates', 'baMen', 'tian_pan_gates', True),     # 天盘门
+    ('tian_pan_stems', 'tianGan', 'tian_pan_stem', True),    # 天盘干
+    ('di_pan_stems', 'tianGan', 'di_pan_stem', True),        # 地盘干
+    ('di_pan_star', 'jiuXing', 'di_pan_star', False),        # 地盘星
+    ('di_pan_gate', 'baMen', 'di_pan_gate', False),          # 地盘门
+)
+
 
 class Palace:
     """代表九宫格中的一个宫"""
+    __slots__ = (
+        'index', 'zhi_fu', 'tian_pan_stars', 'tian_pan_gates', 'tian_pan_stems', 'di_pan_stems',
+        'di_pan_star', 'di_pan_gate', 'wuxing_color', 'analysis',
+        # 兼容属性
+        'god', 'stars', 'gates', 'heaven_stems', 'earth_stems', 'original_star', 'original_gate',
+    )
+
     def __init__(self, index: int):
         self.index: int = index
         self.zhi_fu: str = ""                # 八神 (e.g., "直符")  
@@ -61,7 +113,9 @@ class Palace:
     @classmethod
     def from_dict(cls, data: dict) -> 'Palace':
         """从字典反序列化"""
-        palace = cls(data['index'])
+        # 所有属性都由字典赋值，跳过 __init__ 的默认值初始化
+        palace = cls.__new__(cls)
+        palace.index = data['index']
         palace.zhi_fu = data.get('zhi_fu', '')
         palace.tian_pan_stars = data.get('tian_pan_stars', [])
         palace.tian_pan_gates = data.get('tian_pan_gates', [])
@@ -81,8 +135,40 @@ class Palace:
         palace.original_gate = data.get('original_gate', '')
         return palace
 
+    @classmethod
+    def from_layout(cls, index: int, zhi_fu: str, tian_pan_stars: List[str], tian_pan_gates: List[str],
+                    tian_pan_stems: List[str], di_pan_stems: List[str], di_pan_star: str, di_pan_gate: str,
+                    wuxing_color: str) -> 'Palace':
+        """由排盘结果直接构建宫位，同时填充向后兼容的属性（传入的列表由宫位持有）"""
+        palace = cls.__new__(cls)
+        palace.index = index
+        palace.zhi_fu = zhi_fu
+        palace.tian_pan_stars = tian_pan_stars
+        palace.tian_pan_gates = tian_pan_gates
+        palace.tian_pan_stems = tian_pan_stems
+        palace.di_pan_stems = di_pan_stems
+        palace.di_pan_star = di_pan_star
+        palace.di_pan_gate = di_pan_gate
+        palace.wuxing_color = wuxing_color
+        palace.analysis = {}
+        # 兼容属性
+        palace.god = zhi_fu
+        palace.stars = tian_pan_stars.copy()
+        palace.gates = tian_pan_gates[0] if tian_pan_gates else ""
+        palace.heaven_stems = tian_pan_stems.copy()
+        palace.earth_stems = di_pan_stems.copy()
+        palace.original_star = di_pan_star
+        palace.original_gate = di_pan_gate
+        return palace
+
 class ChartResult:
     """封装完整的排盘结果"""
+    __slots__ = (
+        'si_zhu', 'jieqi', 'ju_shu_info', 'shi_chen_xun', 'zhi_fu', 'zhi_shi', 'tian_yi', 'ma_xing',
+        'kong_wang', '_palaces', 'side_annotations', 'maxing_chongdong_targets', 'qi_ju_time',
+        'nian_ming', '_index_cache', 'special_params',
+    )
+
     def __init__(self):
         self.si_zhu: Dict[str, str] = {}
         self.jieqi: str = ""
@@ -93,7 +179,8 @@ class ChartResult:
         self.tian_yi: str = ""  # 天乙 (九星名)
         self.ma_xing: str = ""
         self.kong_wang: Dict[str, List[str]] = {}
-        self.palaces: List[Palace] = [Palace(i) for i in range(10)] # Index 0 is unused
+        # 宫位列表 (Index 0 is unused)，排盘时整体赋值；未赋值时首次访问才创建空宫位
+        self._palaces: Optional[List[Palace]] = None
         # 新的结构化标注数据，每个标注携带类型信息
         self.side_annotations: Dict[str, List[Dict[str, Union[str, bool]]]] = {}
         # 马星冲动目标分析结果 - 修正为复数形式
@@ -102,11 +189,32 @@ class ChartResult:
         self.qi_ju_time: str = ""
         # 年命干支（用于显示）
         self.nian_ming: str = ""
-        # 反向查询索引
-        self.index: dict = {}
+        # 反向查询索引（首次访问 index 时构建并缓存）
+        self._index_cache: Optional[dict] = None
         # 新增属性: 存放太岁、月干、日干、时干、年命的真实盘面落点
         self.special_params: Dict[str, List[Dict]] = {}
 
+    @property
+    def palaces(self) -> List[Palace]:
+        if self._palaces is None:
+            self._palaces = [Palace(i) for i in range(10)]
+        return self._palaces
+
+    @palaces.setter
+    def palaces(self, palaces: List[Palace]):
+        self._palaces = palaces
+
+    @property
+    def index(self) -> dict:
+        """反向查询索引，首次访问时构建，之后复用缓存"""
+        if self._index_cache is None:
+            self._index_cache = self._build_index()
+        return self._index_cache
+    
+    def invalidate_index(self):
+        """清除索引缓存，修改宫位数据后调用，下次访问 index 时重新构建"""
+        self._index_cache = None
+
     def _build_index(self) -> dict:
         """构建反向查询索引"""
         index = {}
@@ -115,66 +223,22 @@ class ChartResult:
         for palace_idx in range(1, 10):
             palace = self.palaces[palace_idx]
             
-            # 处理八神 (zhi_fu)
-            if palace.zhi_fu:
-                self._add_to_index(index, 'baShen', palace.zhi_fu, palace_idx, 'zhi_fu', palace.zhi_fu)
-            
-            # 处理天盘星 (tian_pan_stars)
-            for star_idx, star in enumerate(palace.tian_pan_stars):
-                if star:
-                    self._add_to_index(index, 'jiuXing', star, palace_idx, 'tian_pan_stars', star, star_idx)
-            
-            # 处理天盘门 (tian_pan_gates)
-            for gate_idx, gate in enumerate(palace.tian_pan_gates):
-                if gate:
-                    self._add_to_index(index, 'baMen', gate, palace_idx, 'tian_pan_gates', gate, gate_idx)
-            
-            # 处理天盘干 (tian_pan_stems)
-            for stem_idx, stem in enumerate(palace.tian_pan_stems):
-                if stem:
-                    self._add_to_index(index, 'tianGan', stem, palace_idx, 'tian_pan_stem', stem, stem_idx)
-            
-            # 处理地盘干 (di_pan_stems)
-            for stem_idx, stem in enumerate(palace.di_pan_stems):
-                if stem:
-                    self._add_to_index(index, 'tianGan', stem, palace_idx, 'di_pan_stem', stem, stem_idx)
-            
-            # 处理地盘星 (di_pan_star)
-            if palace.di_pan_star:
-                self._add_to_index(index, 'jiuXing', palace.di_pan_star, palace_idx, 'di_pan_star', palace.di_pan_star)
-            
-            # 处理地盘门 (di_pan_gate)
-            if palace.di_pan_gate:
-                self._add_to_index(index, 'baMen', palace.di_pan_gate, palace_idx, 'di_pan_gate', palace.di_pan_gate)
+            for attr, param_type, attribute_name, is_list in _INDEX_SPEC:
+                value = getattr(palace, attr)
+                if is_list:
+                    for sub_idx, item in enumerate(value):
+                        if item:
+                            self._add_to_index(index, param_type, item, palace_idx, attribute_name, item, sub_idx)
+                elif value:
+                    self._add_to_index(index, param_type, value, palace_idx, attribute_name, value)
         
         return index
     
     def _add_to_index(self, index: dict, param_type: str, param_name: str, palace_index: int, 
                      attribute_name: str, text: str, sub_index: int = None):
         """添加参数到索引"""
-        if param_type not in index:
-            index[param_type] = {}
-        if param_name not in index[param_type]:
-            index[param_type][param_name] = []
-        
-        # 生成唯一ID
-        if sub_index is not None:
-            unique_id = f"palace_{palace_index}_{attribute_name}_{sub_index}"
-        else:
-            unique_id = f"palace_{palace_index}_{attribute_name}"
-        
-        location_obj = {
-            "palace_index": palace_index,
-            "param_type": param_type,
-            "attribute_name": attribute_name,
-            "text": text,
-            "id": unique_id
-        }
-        
-        if sub_index is not None:
-            location_obj["sub_index"] = sub_index
-            
-        index[param_type][param_name].append(location_obj)
+        index.setdefault(param_type, {}).setdefault(param_name, []).append(
+            IndexEntry(palace_index, param_type, attribute_name, text, sub_index))
 
     def __repr__(self) -> str:
         info_str = (
@@ -215,7 +279,9 @@ class ChartResult:
     @classmethod
     def from_dict(cls, data: dict) -> 'ChartResult':
         """从字典反序列化"""
-        chart_result = cls()
+        # 所有属性都由字典赋值，跳过 __init__ 中默认宫位等对象的构建
+        chart_result = cls.__new__(cls)
+        chart_result._index_cache = None
         chart_result.si_zhu = data.get('si_zhu', {})
         chart_result.jieqi = data.get('jieqi', '')
         chart_result.ju_shu_info = data.get('ju_shu_info', {})
@@ -233,15 +299,15 @@ class ChartResult:
         
         # 反序列化宫位数据
         palaces_data = data.get('palaces', [])
-        chart_result.palaces = [Palace(i) for i in range(10)]  # 重新初始化
+        palaces = [None] * 10
         for palace_data in palaces_data:
             if isinstance(palace_data, dict) and 'index' in palace_data:
                 index = palace_data['index']
                 if 0 <= index < 10:
-                    chart_result.palaces[index] = Palace.from_dict(palace_data)
+                    palaces[index] = Palace.from_dict(palace_data)
         
-        # 重建索引
-        chart_result.index = chart_result._build_index()
+        # 只为字典中缺失的宫位创建空宫位
+        chart_result.palaces = [palace if palace is not None else Palace(i) for i, palace in enumerate(palaces)]
         
         return chart_result
 
@@ -262,6 +328,15 @@ class Case:
         # 值: 标注对象的列表 (e.g., [{"text": "用神", "shape": "circle", "color": "#FF0000"}, {"text": "丈夫", "shape": "square", "color": "#00FF00"}])
         self.annotations: Dict[str, List[Dict[str, str]]] = {}
         
+        # 所有可见图层标注的合并结果缓存（图层或标注变化时清除）
+        self._visible_cache: Optional[Dict[str, List[Dict[str, str]]]] = None
+        # 标注图层的序列化结果缓存（由DataManager维护，图层或标注变化时清除）
+        self.serialized_layers: Optional[str] = None
+        # 上次保存时内容的摘要（由DataManager维护，用于跳过未变化的保存）
+        self.saved_hash: Optional[bytes] = None
+        # 尚未解析的标注图层 (JSON文本, 解析函数)，首次访问 annotation_layers 时解析
+        self._pending_layers: Optional[tuple] = None
+        
         # 新的图层化标注系统
         self.annotation_layers: List[Dict[str, Union[str, bool, Dict[str, List[Dict[str, str]]]]]] = []
         self.active_layer_index: int = -1
@@ -269,6 +344,48 @@ class Case:
         # 初始化默认图层
         self._initialize_default_layer()
         
+    @property
+    def annotation_layers(self) -> List[Dict[str, Union[str, bool, Dict[str, List[Dict[str, str]]]]]]:
+        """标注图层列表"""
+        if self._pending_layers is not None:
+            self._annotation_layers = self._parse_pending_layers()
+        return self._annotation_layers
+        
+    @annotation_layers.setter
+    def annotation_layers(self, layers: List[Dict[str, Union[str, bool, Dict[str, List[Dict[str, str]]]]]]):
+        self._annotation_layers = layers
+        self._pending_layers = None
+        self.invalidate_annotation_cache()
+        
+    def set_serialized_layers(self, layers_json: str, loads: Callable[[str], Any]):
+        """
+        设置序列化的标注图层，推迟到首次访问 annotation_layers 时才解析
+        
+        Args:
+            layers_json: 标注图层的JSON文本
+            loads: JSON解析函数
+        """
+        self._annotation_layers = []
+        self._pending_layers = (layers_json, loads)
+        self._visible_cache = None
+        self.serialized_layers = layers_json
+        
+    def _parse_pending_layers(self) -> List[Dict[str, Union[str, bool, Dict[str, List[Dict[str, str]]]]]]:
+        """解析延迟加载的标注图层，解析失败时回退为一个空的默认图层"""
+        layers_json, loads = self._pending_layers
+        self._pending_layers = None
+        try:
+            return loads(layers_json)
+        except ValueError as e:
+            print(f"反序列化标注图层失败: {e}")
+            self.serialized_layers = None
+            return [{"name": "默认图层", "is_visible": True, "annotations": {}}]
+        
+    def invalidate_annotation_cache(self):
+        """清除可见标注缓存和序列化缓存，直接修改图层中的标注数据后需要调用"""
+        self._visible_cache = None
+        self.serialized_layers = None
+        
     def _initialize_default_layer(self):
         """初始化默认图层"""
         if not self.annotation_layers:
@@ -294,7 +411,10 @@ class Case:
         return {}
         
     def get_all_visible_annotations(self) -> Dict[str, List[Dict[str, str]]]:
-        """获取所有可见图层的标注合并结果"""
+        """获取所有可见图层的标注合并结果（结果会被缓存，调用方不应修改）"""
+        if self._visible_cache is not None:
+            return self._visible_cache
+            
         merged_annotations = {}
         
         for layer in self.annotation_layers:
@@ -305,6 +425,7 @@ class Case:
                         merged_annotations[param_id] = []
                     merged_annotations[param_id].extend(annotations_list)
                     
+        self._visible_cache = merged_annotations
         return merged_annotations
         
     def add_layer(self, name: str = "新图层") -> int:
@@ -315,6 +436,7 @@ class Case:
             "annotations": {}
         }
         self.annotation_layers.append(new_layer)
+        self.invalidate_annotation_cache()
         new_index = len(self.annotation_layers) - 1
         self.active_layer_index = new_index
         return new_index
@@ -323,6 +445,7 @@ class Case:
         """删除指定图层"""
         if 0 <= layer_index < len(self.annotation_layers) and len(self.annotation_layers) > 1:
             self.annotation_layers.pop(layer_index)
+            self.invalidate_annotation_cache()
             
             # 调整激活图层索引
             if self.active_layer_index >= len(self.annotation_layers):
@@ -337,6 +460,7 @@ class Case:
         """重命名图层"""
         if 0 <= layer_index < len(self.annotation_layers):
             self.annotation_layers[layer_index]["name"] = new_name
+            self.invalidate_annotation_cache()
             return True
         return False
         
@@ -344,6 +468,7 @@ class Case:
         """设置图层可见性"""
         if 0 <= layer_index < len(self.annotation_layers):
             self.annotation_layers[layer_index]["is_visible"] = visible
+            self.invalidate_annotation_cache()
             return True
         return False
         
@@ -370,6 +495,7 @@ class Case:
             "color": color
         }
         annotations[param_id].append(annotation)
+        self.invalidate_annotation_cache()
         
     def remove_annotation(self, param_id: str, annotation_index: int = None) -> None:
         """删除标注 - 可以删除指定索引的标注或全部标注"""
@@ -381,6 +507,7 @@ class Case:
         if param_id not in annotations:
             return
             
+        self.invalidate_annotation_cache()
         if annotation_index is None:
             # 删除该参数的所有标注
             del annotations[param_id]
@@ -405,6 +532,7 @@ class Case:
                 "shape": shape,
                 "color": color
             }
+            self.invalidate_annotation_cache()
             
     def has_annotation(self, param_id: str) -> bool:
         """检查参数是否有标注（检查所有可见图层）"""
@@ -1,13 +1,105 @@
 import json
 import datetime
 import os
+import pickle
 import sys
-from typing import Dict, List, Any, Union
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, Dict, List, Any, Sequence, Tuple, Union
 from .models import Palace, ChartResult
 from .calendar_utils import get_solar_term, get_si_zhu
 
+# orjson为可选依赖：可用时用于解析数据文件，否则使用标准库json
+# orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，下面的异常处理对两者通用
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # 定义九宫飞布路径，用于排盘旋转
 LUO_SHU_PATH = [1, 8, 3, 4, 9, 2, 7, 6]
+# 宫位在飞布路径中的位置（LUO_SHU_PATH 的反查表）
+LUO_SHU_INDEX = {palace: i for i, palace in enumerate(LUO_SHU_PATH)}
+# 从某宫出发沿飞布路径顺行(1)/逆行(-1)依次经过的8个宫位：(起始宫, 方向) -> 宫位序列
+LUO_SHU_ROTATIONS = {
+    (palace, direction): tuple(LUO_SHU_PATH[(LUO_SHU_INDEX[palace] + direction * i) % 8] for i in range(8))
+    for palace in LUO_SHU_PATH for direction in (1, -1)
+}
+
+# 地盘三奇六仪排布顺序
+STEMS_ORDER = ("戊", "己", "庚", "辛", "壬", "癸", "丁", "丙", "乙")
+# 八神、九星（不含禽）、八门的轮转顺序，及各自的序号表
+GODS_ORDER = ("符", "蛇", "阴", "合", "虎", "武", "地", "天")
+STARS_ORDER = ("蓬", "任", "冲", "辅", "英", "芮", "柱", "心")
+MEN_ORDER = ("休", "生", "伤", "杜", "景", "死", "惊", "开")
+STARS_INDEX = {cn: i for i, cn in enumerate(STARS_ORDER)}
+MEN_INDEX = {cn: i for i, cn in enumerate(MEN_ORDER)}
+
+# 十二地支（宫侧方标注的位置）
+DI_ZHI = ("子", "丑", "寅", "卯", "辰", "巳", "午", "未", "申", "酉", "戌", "亥")
+
+# 九宫五行
+PALACE_WUXING = {1: '水', 2: '土', 3: '木', 4: '木', 6: '金', 7: '金', 8: '土', 9: '火', 5: '土'}
+
+# 八神简称 -> 全称
+BA_SHEN_NAMES = {
+    "符": "直符", "蛇": "螣蛇", "阴": "太阴", "合": "六合",
+    "虎": "白虎", "武": "玄武", "地": "九地", "天": "九天"
+}
+
+# 马星：时支 -> 驿马地支
+MA_XING_MAP = {
+    "寅": "申", "午": "申", "戌": "申",
+    "亥": "巳", "卯": "巳", "未": "巳",
+    "申": "寅", "子": "寅", "辰": "寅",
+    "巳": "亥", "酉": "亥", "丑": "亥"
+}
+
+# 马星冲动分析用：对宫、地支所在宫、宫内地支
+DUI_GONG_MAP = {1: 9, 9: 1, 2: 8, 8: 2, 3: 7, 7: 3, 4: 6, 6: 4}
+ZHI_TO_GONG_MAP = {
+    "子": 1, "丑": 8, "寅": 8, "卯": 3, "辰": 4, "巳": 4,
+    "午": 9, "未": 2, "申": 2, "酉": 7, "戌": 6, "亥": 6
+}
+GONG_TO_ZHI_LIST_MAP = {
+    1: ("子",), 2: ("未", "申"), 3: ("卯",), 4: ("辰", "巳"), 5: (),
+    6: ("戌", "亥"), 7: ("酉",), 8: ("丑", "寅"), 9: ("午",)
+}
+# 空亡标注类型
+KONG_TYPES = ("rikong", "shikong")
+
+# 六仪击刑规则，按宫位分组：(宫, {天干: 目标地支})
+LIU_JI_RULES = (
+    (3, {"戊": "卯"}),              # 震3宫 -> 卯位
+    (2, {"己": "未"}),              # 坤2宫 -> 未位
+    (8, {"庚": "寅"}),              # 艮8宫 -> 寅位
+    (9, {"辛": "午"}),              # 离9宫 -> 午位
+    (4, {"壬": "辰", "癸": "巳"}),  # 巽4宫 -> 辰位、巳位
+)
+
+# 入墓规则：(宫, 入墓天干, 目标地支)
+RU_MU_RULES = (
+    (8, frozenset(["丁", "己", "庚"]), "丑"),  # 艮8宫 -> 丑位
+    (4, frozenset(["辛", "壬"]), "辰"),        # 巽4宫 -> 辰位
+    (2, frozenset(["乙", "癸"]), "未"),        # 坤2宫 -> 未位
+    (6, frozenset(["乙", "丙", "戊"]), "戌"),  # 乾6宫 -> 戌位
+)
+
+# 按宫位合并的天干规则，标注时逐宫一次完成：(宫, 击刑 {天干: 目标地支} 或 None, 入墓 (入墓天干, 目标地支) 或 None)
+_LIU_JI_BY_GONG = dict(LIU_JI_RULES)
+_RU_MU_BY_GONG = {gong: (gan_set, target_zhi) for gong, gan_set, target_zhi in RU_MU_RULES}
+STEM_RULES_BY_GONG = tuple(
+    (gong, _LIU_JI_BY_GONG.get(gong), _RU_MU_BY_GONG.get(gong))
+    for gong in range(1, 10) if gong in _LIU_JI_BY_GONG or gong in _RU_MU_BY_GONG
+)
+
+# 击刑、入墓标注文字，按天干预先生成
+LIU_JI_TEXT = {gan: f"{gan}击刑" for _, gan_to_zhi in LIU_JI_RULES for gan in gan_to_zhi}
+RU_MU_TEXT = {gan: f"{gan}入墓" for _, gan_set, _ in RU_MU_RULES for gan in gan_set}
+
+# 每个引擎实例缓存的排盘结果数量
+PAIPAN_CACHE_SIZE = 256
 
 def get_resource_path(relative_path):
     """获取资源文件的绝对路径，兼容开发环境和PyInstaller打包环境"""
@@ -23,6 +115,9 @@ def get_resource_path(relative_path):
 class PaiPanEngine:
     """奇门遁甲排盘引擎"""
 
+    # 已解析数据文件缓存：(绝对路径, 修改时间) -> 解析结果，多个引擎实例共享，只读
+    _DATA_CACHE: Dict[Tuple[str, float], Any] = {}
+
     def __init__(self, data_file_path='data/core_parameters.json'):
         """
         构造函数，加载数据文件
@@ -30,24 +125,71 @@ class PaiPanEngine:
         # 使用资源路径辅助函数获取正确的文件路径
         full_path = get_resource_path(data_file_path)
         try:
-            with open(full_path, 'r', encoding='utf-8') as f:
-                self.data = json.load(f)
+            tables = self._load_cached(full_path, self._build_tables)
         except FileNotFoundError:
             raise Exception(f"错误: 数据文件 '{full_path}' 未找到。")
         except json.JSONDecodeError:
             raise Exception(f"错误: 数据文件 '{full_path}' 格式不正确。")
+        
+        self.data = tables['data']
+        self._jiazi_by_ganzhi = tables['jiazi_by_ganzhi']
+        self._xun_to_kong = tables['xun_to_kong']
+        self._star_by_gu = tables['star_by_gu']
+        self._star_by_cn = tables['star_by_cn']
+        self._gate_by_gu = tables['gate_by_gu']
+        self._gate_by_cn = tables['gate_by_cn']
+        self._di_zhi_index = tables['di_zhi_index']
+        self._original_stars = tables['original_stars']
+        self._original_gates = tables['original_gates']
             
         # 加载旺衰规则数据 (FEAT-20250901-024)
         self.parameter_states_data = None
         try:
             states_file_path = get_resource_path('data/data.json')
-            with open(states_file_path, 'r', encoding='utf-8') as f:
-                states_data = json.load(f)
-                self.parameter_states_data = states_data.get('parameterStates', {})
+            self.parameter_states_data = self._load_cached(
+                states_file_path, lambda states_data: states_data.get('parameterStates', {}))
         except (FileNotFoundError, json.JSONDecodeError):
             # 如果旺衰规则数据不存在，记录警告但不中断程序
             print("警告: 旺衰规则数据文件 'data/data.json' 未找到或格式错误，旺衰分析功能不可用。")
 
+        # 地盘布局缓存：(阴阳遁, 局数) -> 地盘干，共18种
+        self._di_pan_cache = {}
+
+        # 排盘结果缓存：盘面只由节气和四柱决定，同一时辰内的不同时刻共用一份
+        self._paipan_cached = lru_cache(maxsize=PAIPAN_CACHE_SIZE)(self._paipan_uncached)
+
+    @classmethod
+    def _load_cached(cls, full_path: str, build: Callable[[Any], Any]) -> Any:
+        """
+        读取并解析JSON数据文件，结果按 (绝对路径, 修改时间) 缓存
+        文件被修改后修改时间变化，下次构造引擎时会重新读取
+        """
+        key = (os.path.abspath(full_path), os.path.getmtime(full_path))
+        if key not in cls._DATA_CACHE:
+            with open(full_path, 'rb') as f:
+                cls._DATA_CACHE[key] = build(_json_loads(f.read()))
+        return cls._DATA_CACHE[key]
+
+    @staticmethod
+    def _build_tables(data: Dict[str, Any]) -> Dict[str, Any]:
+        """由核心参数数据构建排盘用的查找表"""
+        return {
+            'data': data,
+            # 六十甲子查找表：(干, 支) -> 甲子条目，旬首地支 -> 空亡
+            'jiazi_by_ganzhi': {(j['gan'], j['zhi']): j for j in data['liuShiJiaZi']},
+            'xun_to_kong': {j['xun']['zhi']: j['kong'] for j in data['liuShiJiaZi']},
+            # 九星、八门查找表：按故乡宫和中文名索引
+            'star_by_gu': {s['guxiang']: s for s in data['jiuXing']},
+            'star_by_cn': {s['cn']: s for s in data['jiuXing']},
+            'gate_by_gu': {g['guxiang']: g for g in data['baMen']},
+            'gate_by_cn': {g['cn']: g for g in data['baMen']},
+            # 地支序号表：地支中文名 -> 在十二地支中的位置
+            'di_zhi_index': {d['cn']: i for i, d in enumerate(data['diZhi'])},
+            # 地盘星、地盘门：故乡宫 -> 中文名
+            'original_stars': {p['guxiang']: p['cn'] for p in data['jiuXing']},
+            'original_gates': {p['guxiang']: p['cn'] for p in data['baMen']},
+        }
+
     def paipan(self, time_str: str) -> ChartResult:
         """
         公共排盘方法
@@ -56,21 +198,38 @@ class PaiPanEngine:
         if len(time_str) != 14 or not time_str.isdigit():
             raise ValueError("时间字符串格式错误，应为 'yyyymmddhhmmss'")
 
-        target_dt = datetime.datetime.strptime(time_str, '%Y%m%d%H%M%S')
+        # 格式已校验，直接按位切片解析（比 strptime 快得多）
+        target_dt = datetime.datetime(int(time_str[0:4]), int(time_str[4:6]), int(time_str[6:8]),
+                                      int(time_str[8:10]), int(time_str[10:12]), int(time_str[12:14]))
         return self._internal_paipan(target_dt)
 
     def _internal_paipan(self, target_dt: datetime.datetime) -> ChartResult:
         """
         内部排盘主流程 - 升级版本
         """
-        result = ChartResult()
+        # 步骤 1 & 2: 计算节气与四柱
+        jieqi = get_solar_term(target_dt)
+        si_zhu = get_si_zhu(target_dt)
+
+        # 其余步骤只依赖节气和四柱，按二者缓存；调用方会修改返回的盘面（如设置年命），
+        # 因此缓存序列化结果，每次还原出独立副本
+        result = pickle.loads(self._paipan_cached(jieqi, tuple(si_zhu.items())))
         
         # 设置起局时间（用于界面显示）
         result.qi_ju_time = f"{target_dt.year}年{target_dt.month:02d}月{target_dt.day:02d}日 {target_dt.hour:02d}:{target_dt.minute:02d}"
+        return result
 
-        # 步骤 1 & 2: 计算节气与四柱
-        result.jieqi = get_solar_term(target_dt)
-        result.si_zhu = get_si_zhu(target_dt)
+    def _paipan_uncached(self, jieqi: str, si_zhu_items: Tuple[Tuple[str, str], ...]) -> bytes:
+        """排盘的实际计算，返回序列化后的盘面，由 _paipan_cached 缓存"""
+        return pickle.dumps(self._build_chart(jieqi, dict(si_zhu_items)), pickle.HIGHEST_PROTOCOL)
+
+    def _build_chart(self, jieqi: str, si_zhu: Dict[str, str]) -> ChartResult:
+        """
+        由节气和四柱排出完整盘面（不含起局时间）
+        """
+        result = ChartResult()
+        result.jieqi = jieqi
+        result.si_zhu = si_zhu
         ri_zhu = result.si_zhu['日']
         shi_zhu = result.si_zhu['时']
 
@@ -78,20 +237,20 @@ class PaiPanEngine:
         yuan = self._find_yuan(ri_zhu[0], ri_zhu[1])
         result.ju_shu_info = self._find_ju_shu(result.jieqi, yuan)
 
-        # 步骤 4: 排地盘天干
-        di_pan_stems = self._layout_di_pan(result.ju_shu_info)
+        # 步骤 4: 排地盘天干（列表保留顺序用于输出，集合用于成员判断）
+        di_pan_stems, di_pan_sets, stem_to_palace = self._layout_di_pan(result.ju_shu_info)
 
         # 步骤 5: 确定直符值使
         result.shi_chen_xun = self._find_shi_chen_xun(shi_zhu[0], shi_zhu[1])
-        zhi_fu_star, result.zhi_shi, fu_tou_palace = self._find_zhi_fu_zhi_shi(result.shi_chen_xun, di_pan_stems)
+        zhi_fu_star, result.zhi_shi, fu_tou_palace = self._find_zhi_fu_zhi_shi(result.shi_chen_xun, stem_to_palace)
         result.zhi_fu = zhi_fu_star['cn']
 
         # 步骤 6: 排八神
-        ba_shen_layout = self._layout_ba_shen(shi_zhu[0], di_pan_stems, result.ju_shu_info, result.shi_chen_xun)
+        ba_shen_layout = self._layout_ba_shen(shi_zhu[0], stem_to_palace, result.ju_shu_info, result.shi_chen_xun)
 
         # 步骤 7: 排天盘干与九星
-        tian_pan_stems, tian_pan_stars = self._layout_tian_pan_and_stars(shi_zhu[0], di_pan_stems, zhi_fu_star,
-                                                                         result.shi_chen_xun)
+        tian_pan_stems, tian_pan_stars = self._layout_tian_pan_and_stars(shi_zhu[0], di_pan_stems, stem_to_palace,
+                                                                         zhi_fu_star, result.shi_chen_xun)
 
         # 步骤 8: 排八门
         ba_men_layout = self._layout_ba_men(shi_zhu[1], result.shi_chen_xun['zhi'], result.zhi_shi, result.ju_shu_info)
@@ -103,52 +262,34 @@ class PaiPanEngine:
         result.ma_xing = self._find_ma_xing(shi_zhu[1])
         result.kong_wang = self._find_kong_wang(ri_zhu, shi_zhu)
 
-        # 填充九宫信息 - 新的数据模型
-        palace_wuxing = {1: '水', 2: '土', 3: '木', 4: '木', 6: '金', 7: '金', 8: '土', 9: '火', 5: '土'}
-        
-        # 构建地盘星和地盘门映射
-        di_pan_star_map = {p['guxiang']: p['cn'] for p in self.data['jiuXing']}
-        di_pan_gate_map = {p['guxiang']: p['cn'] for p in self.data['baMen']}
-        
-        # 构建八神名称映射
-        ba_shen_name_map = {
-            "符": "直符", "蛇": "螣蛇", "阴": "太阴", "合": "六合",
-            "虎": "白虎", "武": "玄武", "地": "九地", "天": "九天"
-        }
-
+        # 填充九宫信息 - 新的数据模型（直接由布局构建宫位，不预先创建空宫位）
+        # 天盘星、天盘干、八门列表为本次排盘新建，可直接交给宫位；地盘干为缓存共享对象，需复制
+        palaces = [Palace(0)]  # Index 0 is unused
         for i in range(1, 10):
-            palace = result.palaces[i]
-            
-            # 新的数据模型属性
-            palace.zhi_fu = ba_shen_name_map.get(ba_shen_layout[i], ba_shen_layout[i])
-            palace.tian_pan_stars = tian_pan_stars[i].copy()
-            palace.tian_pan_gates = [ba_men_layout[i]] if ba_men_layout[i] else []
-            palace.tian_pan_stems = tian_pan_stems[i].copy()
-            palace.di_pan_stems = di_pan_stems[i].copy()
-            palace.di_pan_star = di_pan_star_map.get(i, "禽")
-            palace.di_pan_gate = di_pan_gate_map.get(i, "")
-            palace.wuxing_color = palace_wuxing[i]
-            
-            # 向后兼容的属性 (deprecated)
-            palace.god = palace.zhi_fu
-            palace.stars = palace.tian_pan_stars.copy()
-            palace.gates = palace.tian_pan_gates[0] if palace.tian_pan_gates else ""
-            palace.heaven_stems = palace.tian_pan_stems.copy()
-            palace.earth_stems = palace.di_pan_stems.copy()
-            palace.original_star = palace.di_pan_star
-            palace.original_gate = palace.di_pan_gate
+            palaces.append(Palace.from_layout(
+                i,
+                zhi_fu=BA_SHEN_NAMES.get(ba_shen_layout[i], ba_shen_layout[i]),
+                tian_pan_stars=tian_pan_stars[i],
+                tian_pan_gates=[ba_men_layout[i]] if ba_men_layout[i] else [],
+                tian_pan_stems=tian_pan_stems[i],
+                di_pan_stems=di_pan_stems[i].copy(),
+                di_pan_star=self._original_stars.get(i, "禽"),
+                di_pan_gate=self._original_gates.get(i, ""),
+                wuxing_color=PALACE_WUXING[i],
+            ))
+        result.palaces = palaces
 
         # 步骤 11: 分析旺衰状态 (FEAT-20250901-024)
         self._analyze_parameter_states(result.palaces)
         
         # 步骤 12: 计算宫侧方自动标注
-        result.side_annotations = self._calculate_annotations(result, di_pan_stems, tian_pan_stems)
+        result.side_annotations = self._calculate_annotations(result, di_pan_stems, tian_pan_stems, di_pan_sets)
         
         # 步骤 13: 分析马星冲动
         result.maxing_chongdong_targets = self._analyze_maxing_chongdong(result)
         
-        # 步骤 14: 构建反向查询索引
-        result.index = result._build_index()
+        # 步骤 14: 宫位数据已填充完毕，使反向查询索引失效（下次访问时重建）
+        result.invalidate_index()
         
         # 步骤 15: 分析特殊参数（四柱、年命）的盘面定位
         result.special_params = self._analyze_special_params(result)
@@ -156,158 +297,143 @@ class PaiPanEngine:
         return result
 
     def _find_yuan(self, ri_gan: str, ri_zhi: str) -> str:
-        for jiazi in self.data['liuShiJiaZi']:
-            if jiazi['gan'] == ri_gan and jiazi['zhi'] == ri_zhi:
-                return jiazi['yuan']
-        raise ValueError("未找到日柱对应的元")
+        try:
+            return self._jiazi_by_ganzhi[(ri_gan, ri_zhi)]['yuan']
+        except KeyError:
+            raise ValueError("未找到日柱对应的元")
 
     def _find_ju_shu(self, jieqi: str, yuan: str) -> Dict[str, Any]:
         info = self.data['jieQiJuShu'][jieqi]
         return {"遁": info['yinyang'], "局": info['jv'][yuan]}
 
-    def _layout_di_pan(self, ju_shu_info: Dict) -> List[List[str]]:
-        stems_order = ["戊", "己", "庚", "辛", "壬", "癸", "丁", "丙", "乙"]
+    def _layout_di_pan(self, ju_shu_info: Dict) -> tuple[List[List[str]], List[frozenset], Dict[str, int]]:
+        """
+        排地盘天干。地盘只由阴阳遁和局数决定，结果按 (遁, 局) 缓存；
+        返回的列表为共享对象，调用方只能读取或复制，不能修改
+        """
+        key = (ju_shu_info['遁'], ju_shu_info['局'])
+        layout = self._di_pan_cache.get(key)
+        if layout is None:
+            layout = self._build_di_pan(*key)
+            self._di_pan_cache[key] = layout
+        return layout
+
+    def _build_di_pan(self, dun: str, start_pos: int) -> tuple[List[List[str]], List[frozenset], Dict[str, int]]:
         di_pan = [[] for _ in range(10)]
-        start_pos = ju_shu_info['局']
 
-        if ju_shu_info['遁'] == '阳遁':
-            for i, stem in enumerate(stems_order):
-                palace_index = (start_pos + i - 1) % 9 + 1
-                di_pan[palace_index].append(stem)
-        else:  # 阴遁
-            for i, stem in enumerate(stems_order):
-                palace_index = (start_pos - i - 1 + 9) % 9 + 1
-                di_pan[palace_index].append(stem)
+        # 阳遁顺排，阴遁逆排
+        direction = 1 if dun == '阳遁' else -1
+        for i, stem in enumerate(STEMS_ORDER):
+            palace_index = (start_pos - 1 + direction * i) % 9 + 1
+            di_pan[palace_index].append(stem)
 
         if di_pan[5]:
             di_pan[2].extend(di_pan[5])
 
-        return di_pan
+        di_pan_sets = [frozenset(stems) for stems in di_pan]
+
+        # 天干 -> 所在宫位；中五宫的干同时寄坤二宫，取宫号较小者（与按宫序查找一致）
+        stem_to_palace = {}
+        for i in range(1, 10):
+            for stem in di_pan[i]:
+                stem_to_palace.setdefault(stem, i)
+
+        return di_pan, di_pan_sets, stem_to_palace
 
     def _find_shi_chen_xun(self, shi_gan: str, shi_zhi: str) -> Dict[str, str]:
-        for jiazi in self.data['liuShiJiaZi']:
-            if jiazi['gan'] == shi_gan and jiazi['zhi'] == shi_zhi:
-                return jiazi['xun']
-        raise ValueError("未找到时柱对应的旬")
+        try:
+            return self._jiazi_by_ganzhi[(shi_gan, shi_zhi)]['xun']
+        except KeyError:
+            raise ValueError("未找到时柱对应的旬")
 
-    def _find_stem_palace(self, stem: str, di_pan_stems: List[List[str]], shi_chen_xun: Dict[str, str]) -> int:
+    def _find_stem_palace(self, stem: str, stem_to_palace: Dict[str, int], shi_chen_xun: Dict[str, str]) -> int:
         target_stem = stem
         if stem == "甲":
             target_stem = shi_chen_xun['jun']
 
-        for i in range(1, 10):
-            if target_stem in di_pan_stems[i]:
-                return i
-
-        return -1
+        return stem_to_palace.get(target_stem, -1)
 
-    def _find_zhi_fu_zhi_shi(self, shi_chen_xun: Dict, di_pan_stems: List[List[str]]) -> tuple[Dict, str, int]:
-        jun_gan = shi_chen_xun['jun']
-        fu_tou_palace = -1
-        for i in range(1, 10):
-            if jun_gan in di_pan_stems[i]:
-                fu_tou_palace = i
-                break
+    def _find_zhi_fu_zhi_shi(self, shi_chen_xun: Dict, stem_to_palace: Dict[str, int]) -> tuple[Dict, str, int]:
+        fu_tou_palace = stem_to_palace.get(shi_chen_xun['jun'], -1)
 
-        original_star = next((s for s in self.data['jiuXing'] if s['guxiang'] == fu_tou_palace), None)
-        original_gate = next((g for g in self.data['baMen'] if g['guxiang'] == fu_tou_palace), None)
+        original_star = self._star_by_gu.get(fu_tou_palace)
+        original_gate = self._gate_by_gu.get(fu_tou_palace)
 
         if fu_tou_palace == 5:
-            zhi_fu_star = next(s for s in self.data['jiuXing'] if s['cn'] == '禽')
-            zhi_shi_gate_cn = next(g for g in self.data['baMen'] if g['guxiang'] == 2)['cn']
+            zhi_fu_star = self._star_by_cn['禽']
+            zhi_shi_gate_cn = self._gate_by_gu[2]['cn']
         else:
             zhi_fu_star = original_star
             zhi_shi_gate_cn = original_gate['cn']
 
         return zhi_fu_star, zhi_shi_gate_cn, fu_tou_palace
 
-    def _layout_ba_shen(self, shi_gan: str, di_pan_stems: List[List[str]], ju_shu_info: Dict, shi_chen_xun: Dict) -> \
+    def _layout_ba_shen(self, shi_gan: str, stem_to_palace: Dict[str, int], ju_shu_info: Dict, shi_chen_xun: Dict) -> \
     List[str]:
-        gods_order = ["符", "蛇", "阴", "合", "虎", "武", "地", "天"]
         layout = [""] * 10
 
-        shi_gan_palace = self._find_stem_palace(shi_gan, di_pan_stems, shi_chen_xun)
+        shi_gan_palace = self._find_stem_palace(shi_gan, stem_to_palace, shi_chen_xun)
 
         if shi_gan_palace == -1:
             raise ValueError(f"无法在地盘上找到时干 '{shi_gan}' 或其遁藏位置")
 
-        layout[shi_gan_palace] = "符"
-
-        path_index = LUO_SHU_PATH.index(shi_gan_palace)
-
-        if ju_shu_info['遁'] == '阳遁':
-            for i in range(1, 8):
-                current_palace = LUO_SHU_PATH[(path_index + i) % 8]
-                layout[current_palace] = gods_order[i]
-        else:
-            for i in range(1, 8):
-                current_palace = LUO_SHU_PATH[(path_index - i + 8) % 8]
-                layout[current_palace] = gods_order[i]
+        # 值符落时干宫，其余八神阳遁顺排、阴遁逆排
+        direction = 1 if ju_shu_info['遁'] == '阳遁' else -1
+        for god, current_palace in zip(GODS_ORDER, LUO_SHU_ROTATIONS[(shi_gan_palace, direction)]):
+            layout[current_palace] = god
 
         return layout
 
-    def _layout_tian_pan_and_stars(self, shi_gan: str, di_pan_stems: List[List[str]], zhi_fu_star: Dict,
-                                   shi_chen_xun: Dict) -> tuple[List[List[str]], List[List[str]]]:
+    def _layout_tian_pan_and_stars(self, shi_gan: str, di_pan_stems: List[List[str]], stem_to_palace: Dict[str, int],
+                                   zhi_fu_star: Dict, shi_chen_xun: Dict) -> tuple[List[List[str]], List[List[str]]]:
         tian_pan_stems = [[] for _ in range(10)]
         tian_pan_stars = [[] for _ in range(10)]
 
-        zhi_fu_palace = self._find_stem_palace(shi_gan, di_pan_stems, shi_chen_xun)
+        zhi_fu_palace = self._find_stem_palace(shi_gan, stem_to_palace, shi_chen_xun)
 
         if zhi_fu_palace == -1:
             raise ValueError(f"无法在地盘上找到时干(直符) '{shi_gan}' 或其遁藏位置")
 
-        stars_order_cn = ["蓬", "任", "冲", "辅", "英", "芮", "柱", "心"]
-        qin_star = next(s for s in self.data['jiuXing'] if s['cn'] == '禽')
+        qin_star_guxiang = self._star_by_cn['禽']['guxiang']
 
-        start_star_index = stars_order_cn.index(zhi_fu_star['cn']) if zhi_fu_star[
-                                                                          'cn'] != '禽' else stars_order_cn.index('芮')
-        path_start_index = LUO_SHU_PATH.index(zhi_fu_palace)
+        start_star_index = STARS_INDEX[zhi_fu_star['cn']] if zhi_fu_star['cn'] != '禽' else STARS_INDEX['芮']
+        rui_palace = -1
 
-        for i in range(8):
-            current_star_cn = stars_order_cn[(start_star_index + i) % 8]
-            current_star_obj = next(s for s in self.data['jiuXing'] if s['cn'] == current_star_cn)
-            current_path_palace = LUO_SHU_PATH[(path_start_index + i) % 8]
+        for i, current_path_palace in enumerate(LUO_SHU_ROTATIONS[(zhi_fu_palace, 1)]):
+            current_star_cn = STARS_ORDER[(start_star_index + i) % 8]
+            current_star_obj = self._star_by_cn[current_star_cn]
 
             tian_pan_stars[current_path_palace].append(current_star_cn)
             tian_pan_stems[current_path_palace].extend(di_pan_stems[current_star_obj['guxiang']])
 
-        rui_palace = -1
-        for i, stars in enumerate(tian_pan_stars):
-            if "芮" in stars:
-                rui_palace = i
-                break
+            # 记录芮星落宫，禽星随芮星
+            if current_star_cn == "芮":
+                rui_palace = current_path_palace
 
         if rui_palace != -1:
             tian_pan_stars[rui_palace].append("禽")
 
-        tian_pan_stems[5].extend(di_pan_stems[qin_star['guxiang']])
+        tian_pan_stems[5].extend(di_pan_stems[qin_star_guxiang])
         tian_pan_stars[5].append("禽")
 
         return tian_pan_stems, tian_pan_stars
 
     def _layout_ba_men(self, shi_zhi: str, xun_zhi: str, zhi_shi_cn: str, ju_shu_info: Dict) -> List[str]:
         layout = [""] * 10
-        di_zhi_order = [d['cn'] for d in self.data['diZhi']]
-        offset = (di_zhi_order.index(shi_zhi) - di_zhi_order.index(xun_zhi) + 12) % 12
-        zhi_shi_obj = next(g for g in self.data['baMen'] if g['cn'] == zhi_shi_cn)
+        offset = (self._di_zhi_index[shi_zhi] - self._di_zhi_index[xun_zhi] + 12) % 12
+        zhi_shi_obj = self._gate_by_cn[zhi_shi_cn]
         start_palace = zhi_shi_obj['guxiang']
 
-        if ju_shu_info['遁'] == '阳遁':
-            zhi_shi_luo_gong = (start_palace + offset - 1) % 9 + 1
-        else:
-            zhi_shi_luo_gong = (start_palace - offset - 1 + 9) % 9 + 1
+        # 阳遁顺数，阴遁逆数
+        direction = 1 if ju_shu_info['遁'] == '阳遁' else -1
+        zhi_shi_luo_gong = (start_palace - 1 + direction * offset) % 9 + 1
 
         if zhi_shi_luo_gong == 5:
             zhi_shi_luo_gong = 2
 
-        men_order_cn = ["休", "生", "伤", "杜", "景", "死", "惊", "开"]
-        men_start_index = men_order_cn.index(zhi_shi_cn)
-        luo_gong_path_index = LUO_SHU_PATH.index(zhi_shi_luo_gong)
-
-        for i in range(8):
-            current_men_cn = men_order_cn[(men_start_index + i) % 8]
-            current_palace = LUO_SHU_PATH[(luo_gong_path_index + i) % 8]
-            layout[current_palace] = current_men_cn
+        men_start_index = MEN_INDEX[zhi_shi_cn]
+        for i, current_palace in enumerate(LUO_SHU_ROTATIONS[(zhi_shi_luo_gong, 1)]):
+            layout[current_palace] = MEN_ORDER[(men_start_index + i) % 8]
 
         return layout
 
@@ -335,36 +461,31 @@ class PaiPanEngine:
 
     # --- 【补全的函数】 ---
     def _find_ma_xing(self, shi_zhi: str) -> str:
-        ma_xing_map = {
-            "寅": "申", "午": "申", "戌": "申",
-            "亥": "巳", "卯": "巳", "未": "巳",
-            "申": "寅", "子": "寅", "辰": "寅",
-            "巳": "亥", "酉": "亥", "丑": "亥"
-        }
-        return ma_xing_map.get(shi_zhi, "")
+        return MA_XING_MAP.get(shi_zhi, "")
 
     def _find_kong_wang(self, ri_zhu: str, shi_zhu: str) -> Dict[str, List[str]]:
         ri_xun = self._find_shi_chen_xun(ri_zhu[0], ri_zhu[1])
         shi_xun = self._find_shi_chen_xun(shi_zhu[0], shi_zhu[1])
 
-        ri_kong = next(j['kong'] for j in self.data['liuShiJiaZi'] if j['xun']['zhi'] == ri_xun['zhi'])
-        shi_kong = next(j['kong'] for j in self.data['liuShiJiaZi'] if j['xun']['zhi'] == shi_xun['zhi'])
+        ri_kong = self._xun_to_kong[ri_xun['zhi']]
+        shi_kong = self._xun_to_kong[shi_xun['zhi']]
 
         return {"日空": ri_kong, "时空": shi_kong}
 
     def _calculate_annotations(self, result: ChartResult, di_pan_stems: List[List[str]], 
-                             tian_pan_stems: List[List[str]]) -> Dict[str, List[Dict[str, Union[str, bool]]]]:
+                             tian_pan_stems: List[List[str]],
+                             di_pan_sets: List[frozenset]) -> Dict[str, List[Dict[str, Union[str, bool]]]]:
         """
         计算宫侧方自动标注 - 结构化版本
         返回格式: {"子": [{"type": "liuji", "text": "戊击刑", "strike": False}], ...}
         """
         # 初始化标注字典
-        annotations = {zhi: [] for zhi in ["子", "丑", "寅", "卯", "辰", "巳", "午", "未", "申", "酉", "戌", "亥"]}
+        annotations = {zhi: [] for zhi in DI_ZHI}
         
         # 分析各种标注
-        self._analyze_liu_ji_structured(annotations, di_pan_stems, tian_pan_stems)
-        self._analyze_ru_mu_structured(annotations, di_pan_stems, tian_pan_stems)
-        self._analyze_kong_wang_structured(annotations, result)
+        self._analyze_stem_rules_structured(annotations, di_pan_stems, tian_pan_stems, di_pan_sets)
+        kong_wang = result.kong_wang
+        self._analyze_kong_wang_structured(annotations, kong_wang['日空'], kong_wang['时空'], result.si_zhu['月'][1])
         self._analyze_yue_wang_ma_xing_structured(annotations, result)
         
         # 处理双标注
@@ -372,69 +493,58 @@ class PaiPanEngine:
         
         return annotations
     
-    def _analyze_liu_ji_structured(self, annotations: Dict[str, List[Dict[str, Union[str, bool]]]], 
-                                 di_pan_stems: List[List[str]], tian_pan_stems: List[List[str]]):
-        """
-        分析击刑情况 - 结构化版本
-        精确映射: 戊→卯, 己→未, 庚→寅, 辛→午, 壬→辰, 癸→巳
-        """
-        ji_xing_rules = {
-            "戊": (3, "卯"),  # 震3宫 -> 卯位
-            "己": (2, "未"),  # 坤2宫 -> 未位
-            "庚": (8, "寅"),  # 艮8宫 -> 寅位
-            "辛": (9, "午"),  # 离9宫 -> 午位
-            "壬": (4, "辰"),  # 巽4宫 -> 辰位
-            "癸": (4, "巳"),  # 巽4宫 -> 巳位
-        }
-        
-        # 检查天盘干和地盘干是否击刑
-        for gan, (gong, target_zhi) in ji_xing_rules.items():
-            # 合并天盘干和地盘干
-            all_gan_list = tian_pan_stems[gong] + di_pan_stems[gong]
-            
-            if gan in all_gan_list:
-                annotations[target_zhi].append({
-                    "type": "liuji",
-                    "text": f"{gan}击刑",
-                    "strike": False
-                })
-    
-    def _analyze_ru_mu_structured(self, annotations: Dict[str, List[Dict[str, Union[str, bool]]]], 
-                                di_pan_stems: List[List[str]], tian_pan_stems: List[List[str]]):
-        """
-        分析入墓情况 - 结构化版本
-        精确映射: 艮8→丑, 巽4→辰, 坤2→未, 乾6→戌
-        """
-        ru_mu_rules = {
-            8: (["丁", "己", "庚"], "丑"),  # 艮8宫 -> 丑位
-            4: (["辛", "壬"], "辰"),        # 巽4宫 -> 辰位
-            2: (["乙", "癸"], "未"),        # 坤2宫 -> 未位
-            6: (["乙", "丙", "戊"], "戌"),  # 乾6宫 -> 戌位
-        }
-        
-        # 检查天盘干和地盘干是否入墓
-        for gong, (gan_list, target_zhi) in ru_mu_rules.items():
-            # 合并天盘干和地盘干
-            all_gan_list = tian_pan_stems[gong] + di_pan_stems[gong]
+    def _analyze_stem_rules_structured(self, annotations: Dict[str, List[Dict[str, Union[str, bool]]]], 
+                                       di_pan_stems: List[List[str]], tian_pan_stems: List[List[str]],
+                                       di_pan_sets: List[frozenset]):
+        """
+        分析击刑与入墓情况 - 结构化版本
+        逐宫处理，每宫只合并一次天盘干与地盘干，同时检查两类规则
+        击刑精确映射: 戊→卯, 己→未, 庚→寅, 辛→午, 壬→辰, 癸→巳
+        入墓精确映射: 艮8→丑, 巽4→辰, 坤2→未, 乾6→戌
+        """
+        for gong, liu_ji_rule, ru_mu_rule in STEM_RULES_BY_GONG:
+            tian_stems = tian_pan_stems[gong]
+            stems = di_pan_sets[gong].union(tian_stems)
             
-            for gan in all_gan_list:
-                if gan in gan_list:
-                    annotations[target_zhi].append({
-                        "type": "rumu",
-                        "text": f"{gan}入墓",
+            # 击刑：天盘干或地盘干中出现即标注
+            if liu_ji_rule:
+                for gan in stems.intersection(liu_ji_rule):
+                    annotations[liu_ji_rule[gan]].append({
+                        "type": "liuji",
+                        "text": LIU_JI_TEXT[gan],
                         "strike": False
                     })
+            
+            # 入墓：先用集合求交判断本宫是否有入墓干，多数宫位到此即可跳过
+            if ru_mu_rule:
+                gan_set, target_zhi = ru_mu_rule
+                hits = stems & gan_set
+                if not hits:
+                    continue
+                
+                # 天盘、地盘各出现一次即各标注一次（同干两次出现时合并为"双X入墓"），按天盘在前的顺序输出
+                for gan in (*tian_stems, *di_pan_stems[gong]):
+                    if gan in hits:
+                        annotations[target_zhi].append({
+                            "type": "rumu",
+                            "text": RU_MU_TEXT[gan],
+                            "strike": False
+                        })
     
     def _analyze_kong_wang_structured(self, annotations: Dict[str, List[Dict[str, Union[str, bool]]]], 
-                                    result: ChartResult):
+                                    ri_kong_list: Sequence[str], shi_kong_list: Sequence[str], yue_zhi: str):
         """
         分析空亡情况 - 结构化版本
         月令空亡用strike标识
+
+        Args:
+            annotations: 待填充的标注字典
+            ri_kong_list: 日空地支
+            shi_kong_list: 时空地支
+            yue_zhi: 月支
         """
-        yue_zhi = result.si_zhu['月'][1]  # 获取月支
-        
         # 检查日空
-        for kong_zhi in result.kong_wang.get('日空', []):
+        for kong_zhi in ri_kong_list:
             is_strike = kong_zhi == yue_zhi
             annotations[kong_zhi].append({
                 "type": "rikong",
@@ -443,7 +553,7 @@ class PaiPanEngine:
             })
         
         # 检查时空
-        for kong_zhi in result.kong_wang.get('时空', []):
+        for kong_zhi in shi_kong_list:
             is_strike = kong_zhi == yue_zhi
             annotations[kong_zhi].append({
                 "type": "shikong", 
@@ -481,16 +591,38 @@ class PaiPanEngine:
             annotation_list = annotations[di_zhi]
             if len(annotation_list) <= 1:
                 continue
+            
+            # 最常见的两条标注：类型不同且不是日空+时空，无需合并
+            if len(annotation_list) == 2:
+                pair_types = {annotation_list[0]["type"], annotation_list[1]["type"]}
+                if len(pair_types) == 2 and pair_types != {"rikong", "shikong"}:
+                    continue
                 
-            # 统计每种类型的标注
-            type_count = {}
+            # 一次遍历完成全部统计：每种类型的数量和第一个标注、空亡删除线、
+            # 入墓各干的出现次数（保持首次出现的顺序）及删除线
+            type_count = Counter()
+            first_of_type = {}
+            kong_strike = False
+            gan_count = Counter()
+            gan_strike = {}
             for annotation in annotation_list:
                 ann_type = annotation["type"]
-                type_count[ann_type] = type_count.get(ann_type, 0) + 1
+                type_count[ann_type] += 1
+                first_of_type.setdefault(ann_type, annotation)
+                if ann_type in ("rikong", "shikong"):
+                    kong_strike = kong_strike or bool(annotation["strike"])
+                elif ann_type == "rumu":
+                    gan = annotation["text"][:-2]  # 去掉"入墓"
+                    gan_count[gan] += 1
+                    gan_strike[gan] = gan_strike.get(gan, False) or bool(annotation["strike"])
             
             # 特殊处理日空+时空的情况
-            has_ri_kong = any(ann["type"] == "rikong" for ann in annotation_list)
-            has_shi_kong = any(ann["type"] == "shikong" for ann in annotation_list)
+            has_ri_kong = type_count["rikong"] > 0
+            has_shi_kong = type_count["shikong"] > 0
+            
+            # 没有重复类型，也没有日空+时空同时出现：保持原样
+            if len(type_count) == len(annotation_list) and not (has_ri_kong and has_shi_kong):
+                continue
             
             # 重新构建标注列表
             new_annotations = []
@@ -501,30 +633,19 @@ class PaiPanEngine:
                 ann_type = annotation["type"]
                 
                 # 处理空亡的双标注
-                if ann_type in ["rikong", "shikong"] and not processed_kong:
+                if ann_type in ("rikong", "shikong") and not processed_kong:
                     if has_ri_kong and has_shi_kong:
-                        # 检查是否有删除线标注
-                        has_strike = any(ann["strike"] for ann in annotation_list 
-                                       if ann["type"] in ["rikong", "shikong"])
+                        # 任一空亡标注有删除线则合并标注带删除线
                         new_annotations.append({
                             "type": "shuangkong",  # 可以定义新类型或选择其一
                             "text": f"双{di_zhi}空",
-                            "strike": has_strike
+                            "strike": kong_strike
                         })
                         processed_kong = True
                     else:
                         new_annotations.append(annotation)
                 # 处理入墓的双标注 - 特殊逻辑
                 elif ann_type == "rumu" and type_count[ann_type] >= 2 and not processed_rumu:
-                    # 收集所有入墓标注，按干支分组
-                    rumu_annotations = [ann for ann in annotation_list if ann["type"] == "rumu"]
-                    gan_count = {}
-                    
-                    # 统计每个干的出现次数
-                    for rumu_ann in rumu_annotations:
-                        gan = rumu_ann["text"].replace("入墓", "")
-                        gan_count[gan] = gan_count.get(gan, 0) + 1
-                    
                     # 根据每个干的出现次数生成标注
                     for gan, count in gan_count.items():
                         if count >= 2:
@@ -534,27 +655,24 @@ class PaiPanEngine:
                             # 单个干，用"X入墓"
                             text = f"{gan}入墓"
                         
-                        # 检查是否有删除线（继承原标注的strike状态）
-                        has_strike = any(ann["strike"] for ann in rumu_annotations 
-                                       if ann["text"] == f"{gan}入墓")
-                        
+                        # 删除线继承原标注的strike状态
                         new_annotations.append({
                             "type": ann_type,
                             "text": text,
-                            "strike": has_strike
+                            "strike": gan_strike[gan]
                         })
                     
                     processed_rumu = True
                 # 处理其他标注的双标注
                 elif type_count[ann_type] >= 2 and ann_type != "rumu":
                     # 找到同类型的第一个标注
-                    if annotation == next(ann for ann in annotation_list if ann["type"] == ann_type):
+                    if annotation == first_of_type[ann_type]:
                         new_annotations.append({
                             "type": ann_type,
                             "text": f"双{annotation['text']}",
                             "strike": annotation["strike"]
                         })
-                elif ann_type not in ["rikong", "shikong", "rumu"] or (not processed_kong and not processed_rumu):
+                elif ann_type not in ("rikong", "shikong", "rumu") or (not processed_kong and not processed_rumu):
                     new_annotations.append(annotation)
             
             annotations[di_zhi] = new_annotations
@@ -571,82 +689,69 @@ class PaiPanEngine:
         if not result.ma_xing:
             return []
             
-        # A. 核心数据与映射关系
-        dui_gong_map = {1: 9, 9: 1, 2: 8, 8: 2, 3: 7, 7: 3, 4: 6, 6: 4}
-        zhi_to_gong_map = {
-            "子": 1, "丑": 8, "寅": 8, "卯": 3, "辰": 4, "巳": 4,
-            "午": 9, "未": 2, "申": 2, "酉": 7, "戌": 6, "亥": 6
-        }
-        gong_to_zhi_list_map = {
-            1: ["子"], 2: ["未", "申"], 3: ["卯"], 4: ["辰", "巳"], 5: [], 
-            6: ["戌", "亥"], 7: ["酉"], 8: ["丑", "寅"], 9: ["午"]
-        }
+        # A. 核心数据与映射关系见模块级常量 DUI_GONG_MAP、ZHI_TO_GONG_MAP、GONG_TO_ZHI_LIST_MAP
         
         # 初始化
         ma_xing_zhi = result.ma_xing
-        ben_gong_index = zhi_to_gong_map[ma_xing_zhi]
-        dui_gong_index = dui_gong_map.get(ben_gong_index)
+        ben_gong_index = ZHI_TO_GONG_MAP[ma_xing_zhi]
+        dui_gong_index = DUI_GONG_MAP.get(ben_gong_index)
         
         # Step 1: 检查本宫入墓
-        targets = self._find_targets_in_gong(ben_gong_index, "rumu", result.side_annotations, gong_to_zhi_list_map)
+        targets = self._find_targets_in_gong(ben_gong_index, "rumu", result.side_annotations)
         if targets:
             return targets
             
         # Step 2: 检查对宫入墓
         if dui_gong_index is not None:
-            targets = self._find_targets_in_gong(dui_gong_index, "rumu", result.side_annotations, gong_to_zhi_list_map)
+            targets = self._find_targets_in_gong(dui_gong_index, "rumu", result.side_annotations)
             if targets:
                 return targets
                 
         # Step 3: 检查本宫空亡
-        targets = self._find_targets_in_gong(ben_gong_index, ["rikong", "shikong"], result.side_annotations, gong_to_zhi_list_map)
+        targets = self._find_targets_in_gong(ben_gong_index, KONG_TYPES, result.side_annotations)
         if targets:
             return targets
             
         # Step 4: 检查对宫空亡
         if dui_gong_index is not None:
-            targets = self._find_targets_in_gong(dui_gong_index, ["rikong", "shikong"], result.side_annotations, gong_to_zhi_list_map)
+            targets = self._find_targets_in_gong(dui_gong_index, KONG_TYPES, result.side_annotations)
             if targets:
                 return targets
                 
         # Step 5: 无目标
         return []
         
-    def _find_targets_in_gong(self, gong_index: int, target_types: Union[str, List[str]], 
+    @staticmethod
+    def _find_targets_in_gong(gong_index: int, target_types: Union[str, Sequence[str]], 
                              all_annotations: Dict[str, List[Dict[str, Union[str, bool]]]], 
-                             gong_to_zhi_list_map: Dict[int, List[str]]) -> List[Dict[str, str]]:
+                             gong_to_zhi_list_map: Dict[int, Sequence[str]] = GONG_TO_ZHI_LIST_MAP) -> List[Dict[str, str]]:
         """
         在指定宫位中查找匹配类型的所有标注目标
         
         Args:
             gong_index: 目标宫位 (1-9)
-            target_types: 目标类型 (字符串或字符串列表)
+            target_types: 目标类型 (字符串或字符串序列)
             all_annotations: 所有标注数据
-            gong_to_zhi_list_map: 宫位到地支列表的映射
+            gong_to_zhi_list_map: 宫位到地支列表的映射，默认为 GONG_TO_ZHI_LIST_MAP
             
         Returns:
             List[Dict[str, str]]: 找到的所有目标对象列表
         """
         found_targets = []
         
-        # 标准化target_types为列表
-        if isinstance(target_types, str):
-            target_types = [target_types]
+        # 标准化target_types为集合，只在循环外处理一次
+        target_set = frozenset((target_types,) if isinstance(target_types, str) else target_types)
             
-        # 获取该宫位对应的所有地支列表
-        zhi_list = gong_to_zhi_list_map.get(gong_index, [])
-        
         # 遍历该宫位的所有地支
-        for zhi in zhi_list:
-            annotations = all_annotations.get(zhi, [])
-            
-            # 遍历该地支位置的所有标注
-            for anno in annotations:
-                if anno.get('type') in target_types:
+        for zhi in gong_to_zhi_list_map.get(gong_index, ()):
+            # 遍历该地支位置的所有标注，每条标注只取一次类型
+            for anno in all_annotations.get(zhi, ()):
+                anno_type = anno.get('type')
+                if anno_type in target_set:
                     found_targets.append({
-                        "type": anno.get('type'),
+                        "type": anno_type,
                         "location_zhi": zhi,
-                        "text": anno.get('text', anno.get('type', ''))
+                        "text": anno.get('text', anno_type or '')
                     })
                     
         return found_targets
@@ -697,7 +802,7 @@ class PaiPanEngine:
                     # 使用旬首遁干查询天盘位置
                     all_locations = chart_result.index.get('tianGan', {}).get(xun_shou_gan, [])
                     # 只保留天盘干位置，过滤掉地盘干位置
-                    location_list = [loc for loc in all_locations if loc.get('attribute_name') == 'tian_pan_stem']
+                    location_list = [loc.to_dict() for loc in all_locations if loc.attribute_name == 'tian_pan_stem']
                 elif param_name in ['太岁', '月干']:
                     # 对于太岁和月干，需要根据年干支或月干支查找旬首遁干
                     if param_name == '太岁':
@@ -709,19 +814,19 @@ class PaiPanEngine:
                     
                     all_locations = chart_result.index.get('tianGan', {}).get(xun_shou_gan, [])
                     # 只保留天盘干位置，过滤掉地盘干位置
-                    location_list = [loc for loc in all_locations if loc.get('attribute_name') == 'tian_pan_stem']
+                    location_list = [loc.to_dict() for loc in all_locations if loc.attribute_name == 'tian_pan_stem']
                 else:  # 年命
                     # 年命的甲也需要查找旬首遁干
                     nian_ming_zhu = self._get_nian_ming_zhu(chart_result)
                     xun_shou_gan = self._find_xun_shou_gan(nian_ming_zhu)
                     all_locations = chart_result.index.get('tianGan', {}).get(xun_shou_gan, [])
                     # 只保留天盘干位置，过滤掉地盘干位置
-                    location_list = [loc for loc in all_locations if loc.get('attribute_name') == 'tian_pan_stem']
+                    location_list = [loc.to_dict() for loc in all_locations if loc.attribute_name == 'tian_pan_stem']
             else:
                 # 非甲的情况，直接查询天盘位置
                 all_locations = chart_result.index.get('tianGan', {}).get(gan, [])
                 # 只保留天盘干位置，过滤掉地盘干位置
-                location_list = [loc for loc in all_locations if loc.get('attribute_name') == 'tian_pan_stem']
+                location_list = [loc.to_dict() for loc in all_locations if loc.attribute_name == 'tian_pan_stem']
             
             special_params[param_name] = location_list
             
@@ -737,9 +842,9 @@ class PaiPanEngine:
         Returns:
             str: 旬首遁干，如"戊"、"癸"
         """
-        for jiazi in self.data['liuShiJiaZi']:
-            if f"{jiazi['gan']}{jiazi['zhi']}" == gan_zhi:
-                return jiazi['xun']['jun']
+        jiazi = self._jiazi_by_ganzhi.get(tuple(gan_zhi))
+        if jiazi is not None:
+            return jiazi['xun']['jun']
         raise ValueError(f"未找到干支 {gan_zhi} 对应的旬首遁干")
     
     def _calculate_nian_ming_gan(self, chart_result: ChartResult) -> str:
@@ -10,6 +10,20 @@ import os
 import sys
 from pathlib import Path
 
+# 用户数据根目录，按平台在导入时确定一次
+if sys.platform == "win32":
+    # Windows: 使用APPDATA目录
+    _USER_DATA_BASE = Path(os.getenv('APPDATA', '')) / 'QiMenWorkbench'
+elif sys.platform == "darwin":
+    # macOS: 使用Application Support目录
+    _USER_DATA_BASE = Path.home() / 'Library' / 'Application Support' / 'QiMenWorkbench'
+else:
+    # Linux和其他Unix系统：使用.config目录
+    _USER_DATA_BASE = Path.home() / '.config' / 'QiMenWorkbench'
+
+# 本进程中已确认存在的目录，避免每次获取路径都重复调用 os.makedirs
+_ensured_dirs = set()
+
 
 def get_resource_path(relative_path: str) -> str:
     """
@@ -46,28 +60,24 @@ def get_user_data_path(relative_path: str = "") -> str:
     Returns:
         str: 用户数据文件的绝对路径
     """
-    if sys.platform == "win32":
-        # Windows: 使用APPDATA目录
-        base_path = os.path.join(os.getenv('APPDATA', ''), 'QiMenWorkbench')
-    elif sys.platform == "darwin":
-        # macOS: 使用Application Support目录
-        base_path = os.path.join(os.path.expanduser('~'), 'Library', 'Application Support', 'QiMenWorkbench')
-    else:
-        # Linux和其他Unix系统：使用.config目录
-        base_path = os.path.join(os.path.expanduser('~'), '.config', 'QiMenWorkbench')
-    
     # 确保目录存在
-    os.makedirs(base_path, exist_ok=True)
+    _ensure_dir(_USER_DATA_BASE)
     
     if relative_path:
-        full_path = os.path.join(base_path, relative_path)
+        full_path = _USER_DATA_BASE / relative_path
         # 确保父目录存在
-        parent_dir = os.path.dirname(full_path)
-        if parent_dir and parent_dir != base_path:
-            os.makedirs(parent_dir, exist_ok=True)
-        return full_path
+        if full_path.parent != _USER_DATA_BASE:
+            _ensure_dir(full_path.parent)
+        return str(full_path)
     else:
-        return base_path
+        return str(_USER_DATA_BASE)
+
+
+def _ensure_dir(path: Path):
+    """确保目录存在，同一目录在本进程中只创建/检查一次"""
+    if path not in _ensured_dirs:
+        os.makedirs(path, exist_ok=True)
+        _ensured_dirs.add(path)
 
 
 def get_templates_file_path() -> str:
@@ -7,18 +7,31 @@ Task ID: FEAT-20250901-019-V3
 """
 
 import os
+import stat
 import json
-from typing import Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from PySide6.QtCore import QSettings
 
+# 扫描工作区时不进入的目录（隐藏目录另按"."开头判断），其中不会存放案例文件
+SKIPPED_DIR_NAMES = frozenset(('__pycache__', 'node_modules', '$RECYCLE.BIN', 'System Volume Information'))
+
+
 class WorkspaceManager:
     """工作区管理器 - 负责工作区路径的存储和管理"""
     
+    # 所有实例共享的QSettings，首次创建管理器时构造，避免重复解析设置存储
+    _shared_settings: Optional[QSettings] = None
+    
     def __init__(self):
         """初始化工作区管理器"""
-        self.settings = QSettings("QiMenWorkbench", "WorkspaceManager")
+        if WorkspaceManager._shared_settings is None:
+            WorkspaceManager._shared_settings = QSettings("QiMenWorkbench", "WorkspaceManager")
+        self.settings = WorkspaceManager._shared_settings
         self.current_workspace_path: Optional[str] = None
         
+        # 扫描结果缓存：扫描根路径 -> ({目录: (mtime, ctime)}, 文件列表)
+        self._scan_cache: Dict[str, Tuple[Dict[str, Tuple[int, int]], List[str]]] = {}
+        
         # 加载上次的工作区路径
         self._load_last_workspace()
         
@@ -41,6 +54,10 @@ class WorkspaceManager:
         if not os.path.exists(workspace_path) or not os.path.isdir(workspace_path):
             return False
             
+        # 与当前工作区相同时设置中已是该值，无需再次写入
+        if workspace_path == self.current_workspace_path:
+            return True
+            
         self.current_workspace_path = workspace_path
         self.settings.setValue("last_workspace_path", workspace_path)
         return True
@@ -64,21 +81,87 @@ class WorkspaceManager:
             list: .qmw文件的完整路径列表
         """
         scan_path = workspace_path or self.current_workspace_path
-        if not scan_path or not os.path.exists(scan_path):
+        if not scan_path:
             return []
             
-        qmw_files = []
-        
-        # 扫描工作区文件夹及子文件夹
-        for root, dirs, files in os.walk(scan_path):
-            for file in files:
-                if file.lower().endswith('.qmw'):
-                    file_path = os.path.join(root, file)
-                    qmw_files.append(file_path)
+        # 上次扫描过的目录都未变化（目录内没有增删改名）时直接返回缓存结果
+        cached = self._scan_cache.get(scan_path)
+        if cached is not None and self._dirs_unchanged(cached[0]):
+            return list(cached[1])
+            
+        # 扫描工作区文件夹及子文件夹（路径不存在或不是文件夹时os.scandir会失败，得到空列表）
+        dir_stamps = {}
+        qmw_entries = list(self._iter_qmw_files(scan_path, dir_stamps))
                     
-        # 按文件名排序
-        qmw_files.sort(key=lambda x: os.path.basename(x).lower())
-        return qmw_files
+        # 按文件名排序（排序键对每个文件只计算一次，文件名直接取自目录项，无需再拆分路径）
+        qmw_entries.sort(key=lambda entry: entry.name.lower())
+        qmw_files = [entry.path for entry in qmw_entries]
+        
+        # 根路径无法访问时不缓存，之后创建该文件夹能被立即扫描到
+        if scan_path in dir_stamps:
+            self._scan_cache[scan_path] = (dir_stamps, qmw_files)
+        return list(qmw_files)
+        
+    def invalidate(self, workspace_path: Optional[str] = None):
+        """
+        清除扫描结果缓存
+        
+        Args:
+            workspace_path: 只清除该路径的缓存，不提供则全部清除
+        """
+        if workspace_path is None:
+            self._scan_cache.clear()
+        else:
+            self._scan_cache.pop(workspace_path, None)
+            
+    @staticmethod
+    def _dir_stamp(path: str) -> Tuple[int, int]:
+        """目录的(修改时间, 状态改变时间)，目录内增删改名或权限变化都会使其改变"""
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_ctime_ns
+        
+    @staticmethod
+    def _dirs_unchanged(dir_stamps: Dict[str, Tuple[int, int]]) -> bool:
+        """检查上次扫描记录的所有目录是否都未变化"""
+        try:
+            return all(WorkspaceManager._dir_stamp(path) == stamp for path, stamp in dir_stamps.items())
+        except OSError:
+            return False
+        
+    @staticmethod
+    def _iter_qmw_files(root: str, dir_stamps: Optional[Dict[str, Tuple[int, int]]] = None) -> Iterator[os.DirEntry]:
+        """
+        递归遍历目录，逐个产出.qmw文件的目录项
+        
+        使用os.scandir，文件类型信息来自读目录时的缓存，不必对每个文件单独stat。
+        与os.walk保持一致：不进入指向目录的符号链接，无法读取的目录直接跳过，
+        先产出当前目录的文件，再依次进入子目录。
+        隐藏目录及 SKIPPED_DIR_NAMES 中的系统目录不会进入。
+        提供dir_stamps时记录每个访问过的目录的时间戳，供扫描缓存校验。
+        """
+        subdirs = []
+        try:
+            # 先记录时间戳再读目录，期间发生的变化会在下次校验时被发现
+            if dir_stamps is not None:
+                dir_stamps[root] = WorkspaceManager._dir_stamp(root)
+            with os.scandir(root) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        name = entry.name
+                        if not (name.startswith('.') or name in SKIPPED_DIR_NAMES or entry.is_symlink()):
+                            subdirs.append(entry.path)
+                    elif entry.name[-4:].lower() == '.qmw':
+                        # 只对末尾4个字符转小写，不复制整个文件名
+                        yield entry
+        except OSError:
+            return
+            
+        for subdir in subdirs:
+            yield from WorkspaceManager._iter_qmw_files(subdir, dir_stamps)
         
     def get_relative_path(self, file_path: str) -> str:
         """
@@ -115,10 +198,16 @@ class WorkspaceManager:
         # 创建主工作区文件夹
         os.makedirs(workspace_path, exist_ok=True)
         
-        # 创建子文件夹结构
+        # 创建子文件夹结构（父目录已存在，逐个mkdir即可，不必每次从base_path逐级检查）
         subdirs = ["案例", "模板", "备份"]
         for subdir in subdirs:
-            os.makedirs(os.path.join(workspace_path, subdir), exist_ok=True)
+            subdir_path = os.path.join(workspace_path, subdir)
+            try:
+                os.mkdir(subdir_path)
+            except FileExistsError:
+                # 与makedirs(exist_ok=True)一致：已存在的若不是文件夹则仍报错
+                if not os.path.isdir(subdir_path):
+                    raise
             
         # 创建README文件
         readme_path = os.path.join(workspace_path, "README.txt")
@@ -149,57 +238,47 @@ class WorkspaceManager:
         if not workspace_path:
             return False, "工作区路径不能为空"
             
-        if not os.path.exists(workspace_path):
+        # 一次stat同时判断是否存在以及是否为文件夹
+        try:
+            st = os.stat(workspace_path)
+        except (OSError, ValueError):
             return False, "工作区路径不存在"
             
-        if not os.path.isdir(workspace_path):
+        if not stat.S_ISDIR(st.st_mode):
             return False, "工作区路径必须是一个文件夹"
             
-        # 检查是否有读写权限
-        try:
-            test_file = os.path.join(workspace_path, ".qmw_test")
-            with open(test_file, 'w') as f:
-                f.write("test")
-            os.remove(test_file)
-        except (OSError, IOError):
+        # 检查是否有读写权限：先用os.access快速排除明显无权限的情况
+        if not os.access(workspace_path, os.R_OK | os.W_OK):
+            return False, "工作区路径没有读写权限"
+            
+        # os.access在Windows上不检查ACL，仍需实际创建文件确认可写
+        if not self._probe_writable(workspace_path):
             return False, "工作区路径没有读写权限"
             
         return True, ""
-
-def test_workspace_manager():
-    """测试工作区管理器"""
-    import tempfile
-    import shutil
-
-    # 创建临时测试目录
-    test_dir = tempfile.mkdtemp()
-        
-    try:
-        # 测试工作区管理器
-        wm = WorkspaceManager()
         
-        # 测试设置工作区
-        success = wm.set_workspace_path(test_dir)
+    @staticmethod
+    def _probe_writable(dir_path: str) -> bool:
+        """
+        在目录中实际创建文件以确认可写
+        Linux上优先使用O_TMPFILE创建匿名文件，关闭即释放，无需删除；
+        不支持时退回创建并删除测试文件
+        """
+        if hasattr(os, 'O_TMPFILE'):
+            try:
+                os.close(os.open(dir_path, os.O_TMPFILE | os.O_WRONLY))
+                return True
+            except PermissionError:
+                return False
+            except OSError:
+                # 文件系统不支持O_TMPFILE，改用测试文件
+                pass
                 
-        # 创建测试.qmw文件
-        test_files = ["案例1.qmw", "案例2.qmw", "subfolder/案例3.qmw"]
-        for file_path in test_files:
-            full_path = os.path.join(test_dir, file_path)
-            os.makedirs(os.path.dirname(full_path), exist_ok=True)
-            with open(full_path, 'w') as f:
-                f.write("test content")
-        
-        # 测试文件扫描
-        qmw_files = wm.scan_qmw_files()
-        for file_path in qmw_files:
-            rel_path = wm.get_relative_path(file_path)
-                        
-        # 测试工作区验证
-        is_valid, error_msg = wm.validate_workspace(test_dir)
-
-    finally:
-        # 清理测试目录
-        shutil.rmtree(test_dir, ignore_errors=True)
-
-if __name__ == "__main__":
-    test_workspace_manager()
+        try:
+            test_file = os.path.join(dir_path, ".qmw_test")
+            with open(test_file, 'w') as f:
+                f.write("test")
+            os.remove(test_file)
+        except (OSError, IOError):
+            return False
+        return True
@@ -0,0 +1,50 @@
+"""
+工作区配置管理器测试
+从 core/workspace_manager.py 移出，避免测试代码进入正式程序的导入路径
+"""
+
+import os
+import sys
+import tempfile
+import shutil
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.workspace_manager import WorkspaceManager
+
+
+def test_workspace_manager():
+    """测试工作区管理器"""
+    # 创建临时测试目录
+    test_dir = tempfile.mkdtemp()
+
+    try:
+        # 测试工作区管理器
+        wm = WorkspaceManager()
+
+        # 测试设置工作区
+        success = wm.set_workspace_path(test_dir)
+
+        # 创建测试.qmw文件
+        test_files = ["案例1.qmw", "案例2.qmw", "subfolder/案例3.qmw"]
+        for file_path in test_files:
+            full_path = os.path.join(test_dir, file_path)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            with open(full_path, 'w') as f:
+                f.write("test content")
+
+        # 测试文件扫描
+        qmw_files = wm.scan_qmw_files()
+        for file_path in qmw_files:
+            rel_path = wm.get_relative_path(file_path)
+
+        # 测试工作区验证
+        is_valid, error_msg = wm.validate_workspace(test_dir)
+
+    finally:
+        # 清理测试目录
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    test_workspace_manager()
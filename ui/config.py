@@ -6,10 +6,14 @@ from typing import Optional
 from PySide6.QtGui import QColor
 
 
-@dataclass
+@dataclass(frozen=True)
 class DisplayConfig:
     """
     显示配置类，用于控制UI组件的显示逻辑
+
+    实例不可变，可在各组件间直接共享；修改配置请使用
+    dataclasses.replace(config, 字段=新值) 生成新对象。
+    wuxing_colors 字典同样不应原地修改。
     """
     # 样式设置
     use_wuxing_colors: bool = True  # 是否使用五行颜色
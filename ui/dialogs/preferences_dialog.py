@@ -60,14 +60,14 @@ class PreferencesDialog(QDialog):
         self.config_manager = config_manager
         
         # 原始配置备份（用于取消操作）
-        self.original_display_config = self.config_manager.load_display_config()
-        self.original_general_config = self.config_manager.load_general_config()
-        self.original_data_config = self.config_manager.load_data_config()
+        self.original_display_config = self.config_manager.display_config
+        self.original_general_config = self.config_manager.general_config
+        self.original_data_config = self.config_manager.data_config
         
         # 当前编辑的配置副本
-        self.current_display_config = self.config_manager.load_display_config()
-        self.current_general_config = self.config_manager.load_general_config()
-        self.current_data_config = self.config_manager.load_data_config()
+        self.current_display_config = self.config_manager.display_config
+        self.current_general_config = self.config_manager.general_config
+        self.current_data_config = self.config_manager.data_config
         
         self.setWindowTitle("首选项")
         self.setMinimumSize(900, 700)
@@ -223,12 +223,14 @@ class PreferencesDialog(QDialog):
             self.current_display_config = self.chart_display_page.get_config()
             self.current_data_config = self.data_cache_page.get_config()
             
-            # 保存到磁盘
-            success1 = self.config_manager.save_general_config(self.current_general_config)
-            success2 = self.config_manager.save_display_config(self.current_display_config)
-            success3 = self.config_manager.save_data_config(self.current_data_config)
+            # 保存到磁盘（三部分配置合并为一次写入）
+            success = self.config_manager.save_all(
+                self.current_display_config,
+                self.current_general_config,
+                self.current_data_config
+            )
             
-            if success1 and success2 and success3:
+            if success:
                 # 更新原始配置备份
                 self.original_general_config = self.current_general_config.copy()
                 self.original_display_config = self.current_display_config
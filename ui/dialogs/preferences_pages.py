@@ -7,6 +7,7 @@ Task ID: FEAT-20250901-020-Comprehensive (全面首选项系统)
 import os
 import json
 import sys
+import dataclasses
 from typing import Dict, Any, List, Optional
 
 # 使用新的路径工具模块
@@ -330,8 +331,10 @@ class ChartDisplayPage(QWidget):
         color = QColorDialog.getColor(current_color, self, f"选择{wuxing}的颜色")
         
         if color.isValid():
-            # 更新配置
-            self.current_config.wuxing_colors[wuxing] = color.name()
+            # 更新配置（DisplayConfig不可变，生成新的颜色字典和配置对象）
+            wuxing_colors = dict(self.current_config.wuxing_colors)
+            wuxing_colors[wuxing] = color.name()
+            self.current_config = dataclasses.replace(self.current_config, wuxing_colors=wuxing_colors)
             
             # 更新预览按钮
             self._update_color_preview_button(wuxing, color.name())
@@ -342,7 +345,9 @@ class ChartDisplayPage(QWidget):
     def _on_restore_default_colors(self):
         """恢复默认颜色"""
         default_config = DisplayConfig()
-        self.current_config.wuxing_colors = default_config.wuxing_colors.copy()
+        self.current_config = dataclasses.replace(
+            self.current_config, wuxing_colors=dict(default_config.wuxing_colors)
+        )
         
         # 更新所有预览按钮
         for wuxing, color_hex in self.current_config.wuxing_colors.items():
@@ -600,6 +600,8 @@ class AnnotationPanelWidget(QWidget):
                     })
                     applied_count += 1
                     
+        if applied_count:
+            self.current_case.invalidate_annotation_cache()
         return applied_count
         
     def _find_matching_params(self, param_type: str, param_value) -> List[str]:
@@ -914,6 +916,7 @@ class AnnotationPanelWidget(QWidget):
                 else:
                     # 如果没有标注了，删除整个参数
                     layer_annotations.pop(param_id, None)
+                self.current_case.invalidate_annotation_cache()
                     
                 # 刷新列表
                 self._refresh_annotation_list()
@@ -922,6 +925,7 @@ class AnnotationPanelWidget(QWidget):
         else:
             # 只有一个标注，直接删除整个参数
             layer_annotations.pop(param_id, None)
+            self.current_case.invalidate_annotation_cache()
             
             # 从列表中删除
             self.annotation_list.takeItem(self.annotation_list.row(current_item))
@@ -952,6 +956,7 @@ class AnnotationPanelWidget(QWidget):
         
         # 清空当前图层的标注数据
         active_layer["annotations"].clear()
+        self.current_case.invalidate_annotation_cache()
         
         # 清空列表
         self.annotation_list.clear()
@@ -1012,6 +1017,7 @@ class AnnotationPanelWidget(QWidget):
             else:
                 # 如果没有标注了，删除整个参数
                 active_layer["annotations"].pop(param_id, None)
+            self.current_case.invalidate_annotation_cache()
                 
             # 刷新列表
             self._refresh_annotation_list()
@@ -1047,6 +1053,7 @@ class AnnotationPanelWidget(QWidget):
             
             # 更新案例数据
             active_layer["annotations"][param_id] = final_annotations
+            self.current_case.invalidate_annotation_cache()
             
             # 刷新显示
             self.set_case(self.current_case)
@@ -1081,6 +1088,7 @@ class AnnotationPanelWidget(QWidget):
             
             # 更新案例数据
             active_layer["annotations"][param_id] = final_annotations
+            self.current_case.invalidate_annotation_cache()
             
             # 刷新列表
             self._refresh_annotation_list()
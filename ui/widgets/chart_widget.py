@@ -846,12 +846,12 @@ def main():
     
     def toggle_colors():
         """切换五行颜色显示"""
-        new_config = DisplayConfig(
+        nonlocal config
+        config = DisplayConfig(
             use_wuxing_colors=not config.use_wuxing_colors,
             show_zhi_fu_shi_bold=config.show_zhi_fu_shi_bold
         )
-        chart_widget.update_config(new_config)
-        config.use_wuxing_colors = new_config.use_wuxing_colors
+        chart_widget.update_config(config)
     
     # 按钮
     update_btn = QPushButton("更新盘面")
@@ -36,7 +36,7 @@ from core.paipan_engine import PaiPanEngine
 from core.models import ChartResult, Case
 from core.data_manager import DataManager
 from core.workspace_manager import WorkspaceManager
-from core.config_manager import ConfigManager
+from core.config_manager import get_config_manager
 from ui.config import DisplayConfig
 from ui.widgets.query_widget import QueryWidget
 from ui.dialogs.case_info_dialog import CaseInfoDialog
@@ -70,10 +70,12 @@ class IntegratedMainWindow(QMainWindow):
         self.global_data = self._load_global_data()
         
         # 配置管理器
-        self.config_manager = ConfigManager()
-        self.current_config = self.config_manager.load_display_config()
-        self.general_config = self.config_manager.load_general_config()
-        self.data_config = self.config_manager.load_data_config()
+        self.config_manager = get_config_manager()
+        # 首次绘制先使用默认显示配置，真实配置在事件循环开始后读取并重新应用
+        self.current_config = self.config_manager.get_startup_display_config()
+        self.config_manager.display_config_loaded.connect(self._apply_config)
+        self.general_config = self.config_manager.general_config
+        self.data_config = self.config_manager.data_config
         
         # V3架构：工作区管理器
         self.workspace_manager = WorkspaceManager()
@@ -722,6 +724,7 @@ class IntegratedMainWindow(QMainWindow):
                         
             # 刷新显示
             if applied_count > 0:
+                case.invalidate_annotation_cache()
                 self._refresh_current_chart_annotations()
                 if self.annotation_panel_widget:
                     self.annotation_panel_widget._refresh_annotation_list()
@@ -1208,14 +1211,14 @@ class IntegratedMainWindow(QMainWindow):
             
             if dialog.exec() == QDialog.Accepted:
                 # 用户点击确定，配置已在对话框中保存
-                self.current_config = self.config_manager.load_display_config()
-                self.general_config = self.config_manager.load_general_config()
-                self.data_config = self.config_manager.load_data_config()
+                self.current_config = self.config_manager.display_config
+                self.general_config = self.config_manager.general_config
+                self.data_config = self.config_manager.data_config
             else:
                 # 用户点击取消，恢复原始配置
-                self.current_config = self.config_manager.load_display_config()
-                self.general_config = self.config_manager.load_general_config()
-                self.data_config = self.config_manager.load_data_config()
+                self.current_config = self.config_manager.display_config
+                self.general_config = self.config_manager.general_config
+                self.data_config = self.config_manager.data_config
                 self._apply_config(self.current_config)
                 
         except Exception as e: